@@ -3,10 +3,31 @@ AtomicStruct defines a structure for parsing raw data efficiently. The
 substructures are compiled into a C-type equivalent.
 """
 from abc import ABCMeta, abstractmethod
-from enum import ReprEnum
-from math import ceil
-from typing import Any
-from copy import copy
+from typing import Any, Callable, TypeVar
+from math import prod
+
+# Indentation strings used by describe, precomputed for usual nesting levels
+_CACHED_INDENT_LEVELS = 32
+_INDENTS = tuple('\t' * level for level in range(_CACHED_INDENT_LEVELS))
+
+# NumPy type codes of common types (little endian, as in NDS files)
+_NUMPY_TYPES = {
+    'char': 'S1',
+    'bool': '?',
+    'uint8_t': 'u1',
+    'uint16_t': '<u2',
+    'uint32_t': '<u4',
+    'uint64_t': '<u8',
+    'int8_t': 'i1',
+    'int16_t': '<i2',
+    'int32_t': '<i4',
+    'int64_t': '<i8',
+    'double': '<f8',
+    'float': '<f4',
+}
+
+# NumPy type codes of unsigned integers by size in bytes, used for bit fields
+_NUMPY_UNSIGNED_TYPES = {1: 'u1', 2: '<u2', 4: '<u4', 8: '<u8'}
 
 class AtomicError(RuntimeError):
     """
@@ -15,38 +36,33 @@ class AtomicError(RuntimeError):
     pass
 
 
-class FieldTypes(str, ReprEnum):
+class FieldType(object):
     """
-    Enumeration of common types that are used in structs with 
-    their name and size in bytes. Their format MUST BE str, int.
-    Also the type name must be the enum element name
-
-    Raises:
-        TypeError: When the format is not str, int
-
-    Returns:
-        str: The data type's name
+    Describes a common type that is used in structs with its name,
+    its size in bytes, its Python type and, when it makes sense,
+    its minimum and maximum values.
     """
-    # Values must be tuple[str, int] corresponding to data's name and size
-    def __new__(cls, *values) -> str:
-        if len(values) < 2:
-            raise TypeError('Field types must have at least 2 arguments, the data type name and its size in bytes')
-        
-        if not isinstance(values[1], int):
-            raise TypeError('Field type size must be an int')
+    __slots__ = ('type_name', 'size', 'python_type', 'min', 'max')
 
-        value = str(values[0])
-        member = str.__new__(cls, value)
-        member._value_ = value
-        return member
-    
+    def __init__(self, type_name: str, size: int, python_type: type, min: int | float = 0, max: int | float = 0) -> None:
+        """
+        Describes a common type that is used in structs with its name,
+        its size in bytes, its Python type and, when it makes sense,
+        its minimum and maximum values.
 
-    @classmethod
-    def from_type_name(cls, type_name: str) -> 'FieldTypes | None':
-        return cls.__members__.get(type_name)
+        Args:
+            type_name (str): The data type's name
+            size (int): The data type's size in bytes
+            python_type (type): The Python type used to store the data
+            min (int | float, optional): Minimum value. Defaults to 0.
+            max (int | float, optional): Maximum value. Defaults to 0.
 
+        Raises:
+            TypeError: When the size is not an int
+        """
+        if not isinstance(size, int):
+            raise TypeError('Field type size must be an int')
 
-    def __init__(self, type_name: str, size: int, python_type: type, min: int | float = 0, max: int | float = 0):
         self.type_name = type_name
         self.size = size
         self.python_type = python_type
@@ -55,24 +71,58 @@ class FieldTypes(str, ReprEnum):
         self.max = max
 
 
-    char = 'char', 1, str
-    bool = 'bool', 1, bool, False, True
-    uint8_t = 'uint8_t', 1, int, 0, 0xFF
-    uint16_t ='uint16_t', 2, int, 0, 0xFFFF
-    uint32_t = 'uint32_t', 4, int, 0, 0xFFFFFFFF
-    uint64_t = 'uint64_t', 8, int, 0, 0xFFFFFFFFFFFFFFFF
-    int8_t = 'int8_t', 1, int, -0x80, 0x7F
-    int16_t = 'int16_t', 2, int, -0x8000, 0x7FFF
-    int32_t = 'int32_t', 4, int, -0x80000000, 0x7FFFFFFF
-    int64_t = 'int64_t', 8, int, -0x8000000000000000, 0x7FFFFFFFFFFFFFFF
-    double = 'double', 8, float, -1e37, 1e37 # Put before else it'll think I use the one of FieldTypes
-    float = 'float', 4, float, -1e37, 1e37
+    def __str__(self) -> str:
+        return self.type_name
+
+
+    def __repr__(self) -> str:
+        return f'<FieldTypes.{self.type_name}>'
+
+
+class FieldTypes(object):
+    """
+    Namespace of common types that are used in structs. Each member
+    is a FieldType whose type name is the member's name.
+    """
+    char = FieldType('char', 1, str)
+    bool = FieldType('bool', 1, bool, False, True)
+    uint8_t = FieldType('uint8_t', 1, int, 0, 0xFF)
+    uint16_t = FieldType('uint16_t', 2, int, 0, 0xFFFF)
+    uint32_t = FieldType('uint32_t', 4, int, 0, 0xFFFFFFFF)
+    uint64_t = FieldType('uint64_t', 8, int, 0, 0xFFFFFFFFFFFFFFFF)
+    int8_t = FieldType('int8_t', 1, int, -0x80, 0x7F)
+    int16_t = FieldType('int16_t', 2, int, -0x8000, 0x7FFF)
+    int32_t = FieldType('int32_t', 4, int, -0x80000000, 0x7FFFFFFF)
+    int64_t = FieldType('int64_t', 8, int, -0x8000000000000000, 0x7FFFFFFFFFFFFFFF)
+    double = FieldType('double', 8, float, -1e37, 1e37) # Put before else it'll think I use the one of FieldTypes
+    float = FieldType('float', 4, float, -1e37, 1e37)
+
+
+    @staticmethod
+    def from_type_name(type_name: str) -> FieldType | None:
+        """
+        Returns the field type corresponding to the type name
+
+        Args:
+            type_name (str): The data type's name
+
+        Returns:
+            FieldType | None: The field type, or None if it is not a common type
+        """
+        return _FIELD_TYPES_BY_NAME.get(type_name)
+
+
+_FIELD_TYPES_BY_NAME: dict[str, FieldType] = {
+    field_type.type_name: field_type for field_type in vars(FieldTypes).values() if isinstance(field_type, FieldType)
+}
 
 
 class AtomicField(object, metaclass=ABCMeta):
     """
     Represents a field in a struct. It must have a size in bytes.
     """
+    __slots__ = ('size', 'bit_size')
+
     size: int
     bit_size: int
 
@@ -91,17 +141,13 @@ class AtomicField(object, metaclass=ABCMeta):
         Returns the field's size if in bits
 
         Returns:
-            int: _description_
+            int: Field's size in bits
         """
-        bit_size = 0
-        if hasattr(self, 'bit_size'):
-            bit_size = self.bit_size
-
-        return bit_size
+        return self.bit_size
     
 
     @abstractmethod
-    def describe(self, level: int) -> str:
+    def describe(self, level: int = 0) -> str:
         """
         String representation of the field
 
@@ -114,18 +160,32 @@ class AtomicField(object, metaclass=ABCMeta):
         pass
 
 
+    def describe_into(self, parts: list[str], level: int = 0) -> None:
+        """
+        Appends the string representation of the field to a list of 
+        fragments, so that a parent can join everything only once
+
+        Args:
+            parts (list[str]): Fragments to append to
+            level (int): Indentation level
+        """
+        parts.append(self.describe(level=level))
+
+
 class AtomicDataField(AtomicField):
     """
     Represents a data field in a struct. It has a name, a type, 
     can have a number of bits and a default value
     """
+    __slots__ = ('name', 'type_name', 'width', 'default')
+
     name: str
     type_name: str
     width: int
     default: Any
 
 
-    def __init__(self, name: str, _type: FieldTypes | str, width: int = 0, default: Any = None) -> None:
+    def __init__(self, name: str, _type: FieldType | str, width: int = 0, default: Any = None) -> None:
         """
         Represents a data field in a struct. It has a name, a type, 
         can have a number of bits and a default value
@@ -136,50 +196,60 @@ class AtomicDataField(AtomicField):
 
         Args:
             name (str): Field's name
-            _type (FieldTypes | str): Field's type, can be custom (in that case set its size afterwards)
+            _type (FieldType | str): Field's type, can be custom (in that case set its size afterwards)
             width (int, optional): Field's size in bits. Defaults to 0.
             default (Any, optional): Field's default value. Defaults to None.
         """
         self.name = name
 
         if width == 0:
-            if isinstance(_type, FieldTypes):
-                self.size = _type.size
-            else:
-                self.size = 0 # No information so nothing!
+            # Custom types have no information so nothing!
+            self.size = getattr(_type, 'size', 0)
+            self.bit_size = 0
         else:
             self.size = 0
             self.bit_size = width
 
-        self.type_name = _type
+        self.type_name = str(_type)
         self.width = width
         self.default = default
 
 
+    def __copy__(self: '_DataFieldT') -> '_DataFieldT':
+        cls = type(self)
+        field = cls.__new__(cls)
+        field.size = self.size
+        field.bit_size = self.bit_size
+        field.name = self.name
+        field.type_name = self.type_name
+        field.width = self.width
+        field.default = self.default
+        return field
+
+
     def describe(self, level: int = 0) -> str:
-        indent = '\t' * level
+        indent = _INDENTS[level] if level < _CACHED_INDENT_LEVELS else '\t' * level
         
         # Example uint32_t test:4;
-        result = f'{indent:s}{self.type_name:s} {self.name:s}'
-
-        if self.width > 0:
-            result += f':{self.width:d}'
-        result += ';'
+        width = f':{self.width}' if self.width > 0 else ''
+        default = f' // default: {self.default}' if self.default is not None else ''
+        return f'{indent}{self.type_name} {self.name}{width};{default}'
 
-        if self.default is not None:
-            result += f' // default: {self.default}'
 
-        return result 
+_DataFieldT = TypeVar('_DataFieldT', bound=AtomicDataField)
 
 
 class AtomicArrayField(AtomicDataField):
     """
     Represents an array field in a struct. It can be a type or a pointer. 
     """
+    __slots__ = ('lengths',)
+
     lengths: tuple[int, ...]
     
 
-    def __init__(self, name: str, _type: FieldTypes | str, *, dimension: int = 1, lengths: tuple[int, ...] = (1,)) -> None:
+    def __init__(self, name: str, _type: FieldType | str, *, dimension: int = 1, lengths: tuple[int, ...] = (1,),
+                 element_size: int | None = None) -> None:
         """
         Represents an array field of a data field in a struct. For an array of
         pointers, see AtomicArrayField.of_pointer
@@ -190,36 +260,46 @@ class AtomicArrayField(AtomicDataField):
 
         Args:
             name (str): Field's name
-            _type (FieldTypes | str): Field's type, can be custom (in that case set its size afterwards)
+            _type (FieldType | str): Field's type, can be custom (in that case set its size afterwards)
             dimension (int, optional): Array's dimension. Defaults to 1.
             lengths (tuple[int, ...], optional): Array's length per dimension. Defaults to (1,).
+            element_size (int | None, optional): Element's size in bytes, replaces the type's size. Defaults to None.
 
         Raises:
             AtomicError: When the number of lengths does not match with the dimension
         """
         self.name = name
-        self.type_name = _type
+        self.type_name = str(_type)
         self.width = dimension
+        self.default = None
+        self.bit_size = 0
 
         if dimension != 0 and len(lengths) != dimension:
             raise AtomicError(f'Length of array\'s length must be equal to the dimension ({len(lengths):d} != {dimension:d})')
         
-        if isinstance(_type, FieldTypes):
-            if dimension == 0: # Just a pointer
-                self.size = 8 
-            else: 
-                self.size = _type.size
-                for dim in range(0, dimension): # Matrix
-                    self.size *= lengths[dim]
+        if element_size is None:
+            size = getattr(_type, 'size', 0) # Custom types have no information so 0
         else:
-            self.size = 0; # No information so 0
+            size = element_size
+        if size != 0:
+            if dimension == 0: # Just a pointer
+                size = 8 
+            else: # Matrix
+                size *= prod(lengths[:dimension])
+        self.size = size
 
         self.lengths = lengths
 
 
+    def __copy__(self) -> 'AtomicArrayField':
+        array = super().__copy__()
+        array.lengths = self.lengths
+        return array
+
+
     # Because Python does not have multiple constructors
     @classmethod
-    def of_pointer(cls, pointer: 'AtomicFieldPointer', *, dimension: int = 1, lengths: tuple[int, ...] = (1,)):
+    def of_pointer(cls, pointer: 'AtomicFieldPointer', *, dimension: int = 1, lengths: tuple[int, ...] = (1,)) -> 'AtomicArrayField':
         """
         Represents an array field of a pointer field in a struct.
 
@@ -232,44 +312,36 @@ class AtomicArrayField(AtomicDataField):
             dimension (int, optional): Array's dimension. Defaults to 1.
             lengths (tuple[int, ...], optional): Array's length per dimension. Defaults to (1,).
         """
-        array = cls(name=pointer.name, _type=pointer.type_name, dimension=dimension, lengths=lengths)
-        array.size = 8
-        if dimension != 0:
-            for dim in range(0, dimension):
-                array.size *= lengths[dim]
-
-        return array
+        return cls(name=pointer.name, _type=pointer.type_name, dimension=dimension, lengths=lengths, element_size=8)
 
 
     def describe(self, level: int = 0) -> str:
-        indent = '\t' * level
-        result = f'{indent:s}{self.type_name:s} {self.name:s}'
-
+        indent = _INDENTS[level] if level < _CACHED_INDENT_LEVELS else '\t' * level
         if self.width == 0:
-            result += '[]'
+            dimensions = '[]'
         else:
-            for dimension in range(0, self.width):
-                result += f'[{self.lengths[dimension]}]'
+            dimensions = ''.join(f'[{length}]' for length in self.lengths[:self.width])
 
-        result += ';'
-        return result
+        return f'{indent}{self.type_name} {self.name}{dimensions};'
 
 
 class AtomicFieldPointer(AtomicDataField):
     """
     Represents a pointer field in a struct
     """
+    __slots__ = ('atomic_data_field',)
+
     atomic_data_field: AtomicDataField
 
     @classmethod
-    def of_type(cls, name: str, _type: FieldTypes | str) -> 'AtomicFieldPointer':
+    def of_type(cls, name: str, _type: FieldType | str) -> 'AtomicFieldPointer':
         """
         Creates a pointer from a type. Useful to create an array of pointers
         without having to create a data field before
 
         Args:
             name (str): Pointer's name
-            _type (FieldTypes | str): Pointer's type
+            _type (FieldType | str): Pointer's type
         """
         field = AtomicDataField(name=name, _type=_type)
         pointer = cls(atomic_data_field=field)
@@ -301,7 +373,7 @@ class AtomicFieldPointer(AtomicDataField):
         Args:
             atomic_data_field (AtomicDataField): Base data field
         """
-        self.atomic_data_field = copy(atomic_data_field)
+        self.atomic_data_field = atomic_data_field.__copy__()
 
         if isinstance(atomic_data_field, AtomicArrayField):
             self.atomic_data_field.name = f'*({self.atomic_data_field.name:s})' 
@@ -312,10 +384,23 @@ class AtomicFieldPointer(AtomicDataField):
         self.name = self.atomic_data_field.name
         self.type_name = self.atomic_data_field.type_name
         self.size = 8 # Size of a pointer
+        self.bit_size = 0
+        self.width = 0
+        self.default = None
+
+
+    def __copy__(self) -> 'AtomicFieldPointer':
+        pointer = super().__copy__()
+        pointer.atomic_data_field = self.atomic_data_field
+        return pointer
 
 
     def describe(self, level: int = 0) -> str:
         return self.atomic_data_field.describe(level=level)
+
+
+    def describe_into(self, parts: list[str], level: int = 0) -> None:
+        self.atomic_data_field.describe_into(parts, level=level)
     
 
 class AtomicStructField(AtomicField):
@@ -323,13 +408,17 @@ class AtomicStructField(AtomicField):
     Represents a struct, base field or embedded in a struct. 
     See AtomicStructBuilder to easily build a struct
     """
+    __slots__ = ('name', 'declared_struct_name', 'fields', 'is_extern', '_describe_cache')
+
     name: str
     declared_struct_name: str
     fields: tuple[AtomicField, ...] # Immutable!
     is_extern: bool
+    # Descriptions by (level, is_extern, name, declared_struct_name)
+    _describe_cache: dict[tuple[int, bool, str, str], str] | None
 
 
-    def __init__(self, name: str, fields: list[AtomicField], declared_struct_name: str = '') -> None:
+    def __init__(self, name: str, fields: list[AtomicField] | tuple[AtomicField, ...], declared_struct_name: str = '') -> None:
         """
         Represents a struct, base field or embedded in a struct. Can be extern 
         with AtomicStructField.set_extern. See AtomicStructBuilder to easily build a struct.
@@ -342,20 +431,22 @@ class AtomicStructField(AtomicField):
 
         Args:
             name (str): Field's name
-            fields (list[AtomicField]): Struct's fields
+            fields (list[AtomicField] | tuple[AtomicField, ...]): Struct's fields, a tuple is used as is
             declared_struct_name (str, optional): Declared struct's name. Defaults to ''.
         """
         self.name = name
         self.declared_struct_name = declared_struct_name
-        self.fields = tuple(fields)
+        self.fields = fields if type(fields) is tuple else tuple(fields)
         self.is_extern = False
+        self._describe_cache = None
 
-        self.size = 0
-        self.bit_size = 0
-        for field in fields:
-            self.bit_size += field.get_bit_size()
-            self.size += field.get_byte_size()
-        self.size += ceil(self.bit_size / 8)
+        bit_size = 0
+        size = 0
+        for field in self.fields:
+            bit_size += field.bit_size
+            size += field.size
+        self.bit_size = bit_size
+        self.size = size + ((bit_size + 7) >> 3)
 
 
     def set_extern(self, status: bool = True) -> 'AtomicStructField':
@@ -366,41 +457,218 @@ class AtomicStructField(AtomicField):
             status (bool, optional): True if needs to be extern. Defaults to True.
         """
         self.is_extern = status
+        self._describe_cache = None
         return self
+
+
+    def __copy__(self) -> 'AtomicStructField':
+        cls = type(self)
+        struct = cls.__new__(cls)
+        struct.size = self.size
+        struct.bit_size = self.bit_size
+        struct.name = self.name
+        struct.declared_struct_name = self.declared_struct_name
+        struct.fields = self.fields
+        struct.is_extern = self.is_extern
+        # Fields are shared and the key holds everything else, so is the cache
+        struct._describe_cache = self._describe_cache
+        return struct
     
 
     def describe(self, level: int = 0) -> str:
-        indent = '\t' * level
-        result = f'{indent:s}'
+        key = (level, self.is_extern, self.name, self.declared_struct_name)
+        if self._describe_cache is None:
+            self._describe_cache = {}
+        else:
+            description = self._describe_cache.get(key)
+            if description is not None:
+                return description
+
+        parts: list[str] = []
+        self._describe_fields_into(parts, level)
+        description = ''.join(parts)
+        self._describe_cache[key] = description
+        return description
+
+
+    def describe_into(self, parts: list[str], level: int = 0) -> None:
+        # Use an already built description, else let fields write directly into the parent's fragments
+        if self._describe_cache is not None:
+            description = self._describe_cache.get((level, self.is_extern, self.name, self.declared_struct_name))
+            if description is not None:
+                parts.append(description)
+                return
+
+        self._describe_fields_into(parts, level)
+
+
+    def _describe_fields_into(self, parts: list[str], level: int) -> None:
+        indent = _INDENTS[level] if level < _CACHED_INDENT_LEVELS else '\t' * level
+        parts.append(indent)
 
         if self.is_extern:
-            result += 'extern '
+            parts.append('extern ')
 
-        result += f'struct '
+        parts.append('struct ')
         
         if self.name != '':
-            result += f'{self.name:s} '
+            parts.append(f'{self.name} ')
 
-        result += '{\n'
-        fields_result = []
-        for field in self.fields:
-            fields_result.append(field.describe(level=level + 1))
-
-        result += '\n'.join(fields_result)
-        result += f'\n{indent:s}}}'
+        parts.append('{\n')
+        for index, field in enumerate(self.fields):
+            if index != 0:
+                parts.append('\n')
+            field.describe_into(parts, level=level + 1)
+        parts.append(f'\n{indent}}}')
 
         if self.declared_struct_name != '':
-            result += f' {self.declared_struct_name:s}'
+            parts.append(f' {self.declared_struct_name}')
+
+        parts.append(';')
+
+
+    def to_numpy_dtype(self) -> Any:
+        """
+        Converts the struct to a NumPy structured dtype, so that raw data can
+        be read in bulk with `numpy.frombuffer(data, dtype=struct.to_numpy_dtype())`.
+        NumPy is only needed when calling this method.
+
+        Pointers are stored as 64-bit unsigned integers and fields of a known
+        size but of an unknown type (like structs fields) as raw bytes. As 
+        NumPy does not support bit fields, each run of consecutive bit fields
+        is stored as one unsigned integer (or raw bytes) named after its first
+        field. The dtype of this integer has a `bit_fields` metadata entry
+        containing a (name, offset, width) tuple per bit field.
+
+        For example (using the flag struct shown in AtomicStructBuilder):
+
+        >>> flags = numpy.frombuffer(b'\\x15', dtype=flag_struct.to_numpy_dtype())
+        >>> flags['enable']
+
+        Output:
+            array([21], dtype=uint8)
+
+        Raises:
+            AtomicError: When a field has no type information
+
+        Returns:
+            numpy.dtype: The struct's dtype
+        """
+        import numpy
+
+        return numpy.dtype(self._numpy_descr(numpy))
+
+
+    def _numpy_descr(self, numpy: Any) -> list[tuple]:
+        descr: list[tuple] = []
+        bit_fields: list[tuple[str, int, int]] = []
+        bit_offset = 0
 
-        result += ';'
-        return result
+        def flush_bit_fields() -> None:
+            byte_size = (bit_offset + 7) >> 3
+            code = _NUMPY_UNSIGNED_TYPES.get(byte_size, f'V{byte_size:d}')
+            descr.append((bit_fields[0][0], numpy.dtype(code, metadata={'bit_fields': tuple(bit_fields)})))
+
+        for field in self.fields:
+            if isinstance(field, AtomicDataField) and field.bit_size != 0:
+                bit_fields.append((field.name, bit_offset, field.bit_size))
+                bit_offset += field.bit_size
+                continue
+
+            if bit_fields:
+                flush_bit_fields()
+                bit_fields = []
+                bit_offset = 0
+
+            if isinstance(field, AtomicStructField):
+                name = field.declared_struct_name or field.name
+                if name == '':
+                    # Anonymous struct, its fields are the parent's fields
+                    descr.extend(field._numpy_descr(numpy))
+                else:
+                    descr.append((name, field._numpy_descr(numpy)))
+            
+            elif isinstance(field, AtomicFieldPointer):
+                descr.append((field.name.lstrip('*').strip('()'), '<u8'))
+
+            elif isinstance(field, AtomicArrayField):
+                code: str | None
+                # No dimension is a pointer, and a starred name an array of pointers
+                if field.width == 0 or field.name.startswith('*'):
+                    code = '<u8'
+                else:
+                    code = _NUMPY_TYPES.get(field.type_name)
+                    if code is None:
+                        element_size = field.size // prod(field.lengths)
+                        if element_size == 0:
+                            raise AtomicError(f'Cannot convert field {field.name:s} of type {field.type_name:s} to a NumPy type')
+                        code = f'V{element_size:d}'
+
+                if field.width == 0:
+                    descr.append((field.name, code))
+                else:
+                    descr.append((field.name.lstrip('*'), code, field.lengths))
+
+            elif isinstance(field, AtomicDataField):
+                code = _NUMPY_TYPES.get(field.type_name)
+                if code is None:
+                    if field.size == 0:
+                        raise AtomicError(f'Cannot convert field {field.name:s} of type {field.type_name:s} to a NumPy type')
+                    code = f'V{field.size:d}'
+                descr.append((field.name, code))
+
+        if bit_fields:
+            flush_bit_fields()
+
+        return descr
+
+
+def _pointer_field(name: str, _type: FieldType | str) -> AtomicFieldPointer:
+    return AtomicFieldPointer(AtomicDataField(name=name, _type=_type))
+
+
+def _pointer_of_array(name: str, _type: FieldType | str, *, dimension: int = 1, lengths: tuple[int, ...] = (1,)) -> AtomicFieldPointer:
+    return AtomicFieldPointer(AtomicArrayField(name=name, _type=_type, dimension=dimension, lengths=lengths))
+
+
+def _struct_field(name: str, struct: AtomicStructField) -> AtomicDataField:
+    field = AtomicDataField(name=name, _type=f'struct {struct.name:s}')
+    field.size = struct.get_byte_size()
+    return field
+
+
+def _struct_array(name: str, struct: AtomicStructField, *, dimension: int = 1, lengths: tuple[int, ...] = (1,)) -> AtomicArrayField:
+    # Dimension 0 is just a pointer
+    return AtomicArrayField(name=name,
+                            _type=f'struct {struct.name:s}',
+                            dimension=dimension,
+                            lengths=lengths,
+                            element_size=8 if dimension == 0 else struct.size)
+
+
+def _pointer_struct_field(name: str, struct: AtomicStructField) -> AtomicFieldPointer:
+    return AtomicFieldPointer(AtomicDataField(name=name, _type=f'struct {struct.name:s}'))
+
+
+# Field constructors by kind, used by AtomicStructBuilder.add
+_FIELD_CONSTRUCTORS: dict[str, Callable[..., AtomicField]] = {
+    'field': AtomicDataField,
+    'custom': AtomicDataField,
+    'array': AtomicArrayField,
+    'pointer': _pointer_field,
+    'pointer_of_array': _pointer_of_array,
+    'struct_field': _struct_field,
+    'struct_array': _struct_array,
+    'pointer_struct_field': _pointer_struct_field,
+}
 
 
 class AtomicStructBuilder(object):
     """
     A builder to quickly and easily build an AtomicStructField.
     """
-    fields: dict[str, AtomicField]
+    fields: list[AtomicField]
+    _indexes: dict[str, int]
 
 
     def __init__(self) -> None:
@@ -426,7 +694,25 @@ class AtomicStructBuilder(object):
             };
             Struct size: 1 byte(s)
         """
-        self.fields = {}
+        self.fields = []
+        self._indexes = {}
+
+
+    def _set_field(self, name: str, field: AtomicField) -> None:
+        """
+        Adds the field at the end of the struct, or replaces the field 
+        with the same name keeping its position
+
+        Args:
+            name (str): Field's name
+            field (AtomicField): Field to add
+        """
+        index = self._indexes.get(name)
+        if index is None:
+            self._indexes[name] = len(self.fields)
+            self.fields.append(field)
+        else:
+            self.fields[index] = field
 
 
     def remove_field(self, name: str) -> None:
@@ -436,11 +722,53 @@ class AtomicStructBuilder(object):
         Args:
             name (str): Field's name
         """
-        if name in self.fields:
-            del self.fields[name]
+        index = self._indexes.pop(name, None)
+        if index is not None:
+            del self.fields[index]
+            for field_name, field_index in self._indexes.items():
+                if field_index > index:
+                    self._indexes[field_name] = field_index - 1
+
+
+    def add(self, kind: str, name: str, **kwargs: Any) -> 'AtomicStructBuilder':
+        """
+        Adds a field of a given kind to the struct. This is useful when the
+        struct is described by data (a schema loaded from a file for example)
+        rather than by code. The keyword arguments are the ones of the 
+        corresponding `add_*` method, with `_type` for the type. Kinds are:
+        'field', 'custom', 'array', 'pointer', 'pointer_of_array', 
+        'struct_field', 'struct_array' and 'pointer_struct_field'.
+
+        For example:
+
+        >>> example_struct = AtomicStructBuilder().add('field', 'id', _type=FieldTypes.uint64_t)\\
+        >>> ...                                   .add('array', 'matrix', _type=FieldTypes.uint8_t, dimension=2, lengths=(10, 20))\\
+        >>> ...                                   .build('example')
+        >>> example_struct.describe()
+
+        Output:
+            struct example {
+                uint64_t id;
+                uint8_t matrix[10][20];
+            };
+
+        Args:
+            kind (str): Field's kind
+            name (str): Field's name
+            **kwargs (Any): Field's arguments
+
+        Raises:
+            AtomicError: When the kind is unknown
+        """
+        constructor = _FIELD_CONSTRUCTORS.get(kind)
+        if constructor is None:
+            raise AtomicError(f'Unknown field kind {kind:s}')
+
+        self._set_field(name, constructor(name=name, **kwargs))
+        return self
 
 
-    def add_field(self, name: str, _type: FieldTypes, *, width: int = 0, default: Any = None) -> 'AtomicStructBuilder':
+    def add_field(self, name: str, _type: FieldType, *, width: int = 0, default: Any = None) -> 'AtomicStructBuilder':
         """
         Adds a field to the struct.
 
@@ -456,18 +784,18 @@ class AtomicStructBuilder(object):
 
         Args:
             name (str): Field's name
-            _type (FieldTypes): Field's type
+            _type (FieldType): Field's type
             width (int, optional): Field's size in bits. Defaults to 0.
             default (Any, optional): Field's default value. Defaults to None.
         """
-        self.fields[name] = AtomicDataField(name=name,
-                                            _type=_type,
-                                            width=width,
-                                            default=default)
+        self._set_field(name, AtomicDataField(name=name,
+                                              _type=_type,
+                                              width=width,
+                                              default=default))
         return self
 
 
-    def add_array(self, name: str, _type: FieldTypes, *, dimension: int = 1, lengths: tuple[int, ...] = (1,)) -> 'AtomicStructBuilder':
+    def add_array(self, name: str, _type: FieldType, *, dimension: int = 1, lengths: tuple[int, ...] = (1,)) -> 'AtomicStructBuilder':
         """
         Adds an array to the struct. 
 
@@ -483,14 +811,14 @@ class AtomicStructBuilder(object):
 
         Args:
             name (str): Array's name
-            _type (FieldTypes): Array's type
+            _type (FieldType): Array's type
             dimension (int, optional): Array's dimension. Defaults to 1.
             lengths (tuple[int, ...], optional): Array's length per dimension. Defaults to (1,).
         """
-        self.fields[name] = AtomicArrayField(name=name,
-                                             _type=_type,
-                                             dimension=dimension,
-                                             lengths=lengths)
+        self._set_field(name, AtomicArrayField(name=name,
+                                               _type=_type,
+                                               dimension=dimension,
+                                               lengths=lengths))
         return self
 
 
@@ -514,14 +842,14 @@ class AtomicStructBuilder(object):
             dimension (int, optional): Array's dimension. Defaults to 1.
             lengths (tuple[int, ...], optional): Array's length per dimension. Defaults to (1,).
         """
-        self.fields[name] = AtomicArrayField(name=name,
-                                             _type=type_name,
-                                             dimension=dimension,
-                                             lengths=lengths)
+        self._set_field(name, AtomicArrayField(name=name,
+                                               _type=type_name,
+                                               dimension=dimension,
+                                               lengths=lengths))
         return self
 
 
-    def add_pointer_field(self, name: str, _type: FieldTypes) -> 'AtomicStructBuilder':
+    def add_pointer_field(self, name: str, _type: FieldType) -> 'AtomicStructBuilder':
         """
         Adds a pointer to the struct.
 
@@ -537,10 +865,10 @@ class AtomicStructBuilder(object):
 
         Args:
             name (str): Pointer's name
-            _type (FieldTypes): Pointer's type
+            _type (FieldType): Pointer's type
         """
-        self.fields[name] = AtomicFieldPointer(AtomicDataField(name=name,
-                                                               _type=_type))
+        self._set_field(name, AtomicFieldPointer(AtomicDataField(name=name,
+                                                                 _type=_type)))
         return self
     
 
@@ -562,12 +890,12 @@ class AtomicStructBuilder(object):
             name (str): Pointer's name
             type_name (str): Pointer's type
         """
-        self.fields[name] = AtomicFieldPointer(AtomicDataField(name=name,
-                                                               _type=type_name))
+        self._set_field(name, AtomicFieldPointer(AtomicDataField(name=name,
+                                                                 _type=type_name)))
         return self
 
 
-    def add_pointer_of_array(self, name: str, _type: FieldTypes, *, dimension: int = 1, lengths: tuple[int, ...] = (1,)) -> 'AtomicStructBuilder':
+    def add_pointer_of_array(self, name: str, _type: FieldType, *, dimension: int = 1, lengths: tuple[int, ...] = (1,)) -> 'AtomicStructBuilder':
         """
         Adds a pointer to an array.
 
@@ -583,14 +911,14 @@ class AtomicStructBuilder(object):
 
         Args:
             name (str): Pointer's name
-            _type (FieldTypes): Array's type
+            _type (FieldType): Array's type
             dimension (int, optional): Array's dimension. Defaults to 1.
             lengths (tuple[int, ...], optional): Array's length per dimension. Defaults to (1,).
         """
-        self.fields[name] = AtomicFieldPointer(AtomicArrayField(name=name,
-                                                                _type=_type,
-                                                                dimension=dimension,
-                                                                lengths=lengths))
+        self._set_field(name, AtomicFieldPointer(AtomicArrayField(name=name,
+                                                                  _type=_type,
+                                                                  dimension=dimension,
+                                                                  lengths=lengths)))
         return self
     
 
@@ -613,9 +941,9 @@ class AtomicStructBuilder(object):
             dimension (int, optional): Array's dimension. Defaults to 1.
             lengths (tuple[int, ...], optional): Array's length per dimension. Defaults to (1,).
         """
-        self.fields[pointer.name] = AtomicArrayField.of_pointer(pointer=pointer, 
-                                                        dimension=dimension, 
-                                                        lengths=lengths)
+        self._set_field(pointer.name, AtomicArrayField.of_pointer(pointer=pointer, 
+                                                          dimension=dimension, 
+                                                          lengths=lengths))
         return self
 
     
@@ -664,12 +992,12 @@ class AtomicStructBuilder(object):
             show_struct_name (bool): True if struct's name needs to be displayed, False otherwise
             declared_struct_name (str): Struct's name if declared as a variable. Defaults to ''
         """
-        copied_struct = copy(struct)
+        copied_struct = struct.__copy__()
         copied_struct.declared_struct_name = declared_struct_name
         if not show_struct_name:
             copied_struct.name = ''
 
-        self.fields[struct.name] = copied_struct
+        self._set_field(struct.name, copied_struct)
         return self
     
 
@@ -691,12 +1019,7 @@ class AtomicStructBuilder(object):
             name (str): Field's name
             struct (AtomicStructField): Struct to add
         """
-        field = AtomicDataField(name=name,
-                                _type=f'struct {struct.name:s}',
-                                width=0,
-                                default=None)
-        field.size = struct.get_byte_size()
-        self.fields[name] = field
+        self._set_field(name, _struct_field(name, struct))
         return self
     
 
@@ -720,17 +1043,7 @@ class AtomicStructBuilder(object):
             dimension (int, optional): Array's dimension. Defaults to 1.
             lengths (tuple[int, ...], optional): Array's length per dimension. Defaults to (1,).
         """
-        struct_array = AtomicArrayField(name=name,
-                                        _type=f'struct {struct.name:s}',
-                                        dimension=dimension,
-                                        lengths=lengths)
-        if dimension == 0: # Just a pointer
-            struct_array.size = 8 
-        else: 
-            struct_array.size = struct.size
-            for dim in range(0, dimension): # Matrix
-                struct_array.size *= lengths[dim]
-        self.fields[name] = struct_array
+        self._set_field(name, _struct_array(name, struct, dimension=dimension, lengths=lengths))
         return self
     
 
@@ -752,10 +1065,7 @@ class AtomicStructBuilder(object):
             name (str): Pointer's name
             struct (AtomicStructField): Struct to add
         """
-        self.fields[name] = AtomicFieldPointer(AtomicDataField(name=name,
-                                                               _type=f'struct {struct.name:s}',
-                                                               width=0,
-                                                               default=None))
+        self._set_field(name, _pointer_struct_field(name, struct))
         return self
     
 
@@ -776,8 +1086,8 @@ class AtomicStructBuilder(object):
             name (str): Field's name
             custom_type_name (str): Custom type's name
         """
-        self.fields[name] = AtomicDataField(name=name,
-                                            _type=custom_type_name)
+        self._set_field(name, AtomicDataField(name=name,
+                                              _type=custom_type_name))
         return self
 
     
@@ -789,5 +1099,5 @@ class AtomicStructBuilder(object):
             name (str): Struct's name
             declared_struct_name (str, optional): Struct's name if declared as a variable . Defaults to ''.
         """
-        return AtomicStructField(name=name, fields=list(self.fields.values()), declared_struct_name=declared_struct_name)
+        return AtomicStructField(name=name, fields=self.fields, declared_struct_name=declared_struct_name)
     
\ No newline at end of file
@@ -1,9 +1,19 @@
 
 import array
-from struct import unpack, pack
+from struct import Struct, pack
 from collections import namedtuple
+from typing import Any
 
-from rawdb.util.io import BinaryIO
+from rawdb.interfaces.binary_io import IOHandler, StructModes
+from rawdb.util.io import IOBytesHandler
+
+# Numba is optional, it only speeds up the compressor's match search
+try:
+    import numpy
+    from numba import njit
+    _HAS_NUMBA = True
+except ImportError:
+    _HAS_NUMBA = False
 
 COMPRESSION_LZ77 = 0x10
 COMPRESSION_LZSS = 0x11
@@ -11,13 +21,183 @@ COMPRESSION_LZSS = 0x11
 
 LZHeader = namedtuple('LZHeader', 'flag size')
 
+# Precompiled readers of the stream's big-endian tokens and of the header
+_unpack_token = Struct('>H').unpack_from
+_unpack_header = Struct('<I').unpack
+
 # TODO Change this to one LZ object that can compress/uncompress OR just functions
 
+def _lz_decode(src: bytes | memoryview, size: int, lz_ss: bool) -> bytearray:
+    """
+    Decodes a LZ77/LZSS stream (without its header) in memory
+
+    Args:
+        src (bytes | memoryview): Compressed data following the header
+        size (int): Decompressed size
+        lz_ss (bool): True if the stream is LZSS, False if LZ77
+
+    Returns:
+        bytearray: Decompressed data
+    """
+    out = bytearray(size)
+    cursz = 0
+    pos = 0
+    while cursz < size:
+        flag = src[pos]
+        pos += 1
+        for x in range(7, -1, -1):
+            if cursz >= size:
+                break
+            if not (flag >> x) & 0x1:
+                out[cursz] = src[pos]
+                cursz += 1
+                pos += 1
+                continue
+            head, = _unpack_token(src, pos)
+            pos += 2
+            if not lz_ss:
+                count = ((head >> 12) & 0xF) + 3
+                back = head & 0xFFF
+            else:
+                ind = (head >> 12) & 0xF
+                if not ind:
+                    tail = src[pos]
+                    pos += 1
+                    count = (head >> 4) + 0x11
+                    back = ((head & 0xF) << 8) | tail
+                elif ind == 1:
+                    tail, = _unpack_token(src, pos)
+                    pos += 2
+                    count = (((head & 0xFFF) << 4) | (tail >> 12)) + 0x111
+                    back = tail & 0xFFF
+                else:
+                    count = ind + 1
+                    back = head & 0xFFF
+            distance = back + 1
+            copy_start = cursz - distance
+            if distance >= count:
+                out[cursz:cursz + count] = out[copy_start:copy_start + count]
+            else:
+                # Overlapping copy, the last distance bytes repeat themselves
+                pattern = out[copy_start:cursz]
+                out[cursz:cursz + count] = (pattern * (count // distance + 1))[:count]
+            cursz += count
+    return out
+
+
+# Hash chain parameters of the compressor's match search
+_HASH_BITS = 15
+_HASH_MASK = (1 << _HASH_BITS) - 1
+_MAX_CHAIN = 32
+# Compression level from which a match is deferred when the next position
+# has a longer one (lazy matching)
+_LAZY_LEVEL = 5
+
+
+def _match_length(data, first: int, second: int, length: int) -> int:
+    """
+    Counts the matching bytes at two positions. The ranges are compared at
+    once as integers: the lowest set bit of their XOR is the first mismatch.
+
+    Args:
+        data (bytes): Uncompressed data
+        first (int): First position
+        second (int): Second position
+        length (int): Maximum number of bytes to compare
+
+    Returns:
+        int: Number of matching bytes, up to length
+    """
+    if length <= 0:
+        return 0
+    diff = int.from_bytes(data[first:first + length], 'little') ^ int.from_bytes(data[second:second + length], 'little')
+    if not diff:
+        return length
+    return ((diff & -diff).bit_length() - 1) >> 3
+
+
+if _HAS_NUMBA:
+    # Integer conversions do not compile, a byte loop is already fast there
+    @njit(cache=True, boundscheck=False)
+    def _match_length(data, first: int, second: int, length: int) -> int:
+        idx = 0
+        while idx < length and data[first + idx] == data[second + idx]:
+            idx += 1
+        return idx
+
+
+def _find_best_match(data, pos: int, search_start: int, endpos: int, max_len: int,
+                     head, prev, next_insert: int) -> tuple[int, int, int]:
+    """
+    Searches the window for the longest match of the data at pos. Positions
+    are indexed by a hash of their first 3 bytes (the minimum match length),
+    so only candidates sharing this hash are checked, most recent first and
+    at most _MAX_CHAIN of them. On equal lengths the closest match is kept.
+
+    Args:
+        data (bytes | numpy.ndarray): Uncompressed data
+        pos (int): Position to match
+        search_start (int): Start of the window
+        endpos (int): End of the data
+        max_len (int): Maximum match length
+        head (list[int] | numpy.ndarray): Most recent position per hash, -1 if none
+        prev (list[int] | numpy.ndarray): Previous position with the same hash, per position
+        next_insert (int): First position not indexed yet
+
+    Returns:
+        tuple[int, int, int]: Best match position (-1 if none), its length 
+        and the new first position not indexed yet
+    """
+    # Index every position before pos
+    while next_insert < pos and next_insert + 2 < endpos:
+        key = (data[next_insert] << 16) | (data[next_insert + 1] << 8) | data[next_insert + 2]
+        hashed = (((key * 0x9E3779B1) & 0xFFFFFFFF) >> (32 - _HASH_BITS)) & _HASH_MASK
+        prev[next_insert] = head[hashed]
+        head[hashed] = next_insert
+        next_insert += 1
+
+    best_pos = -1
+    best_len = 0
+    if pos + 2 < endpos:
+        key = (data[pos] << 16) | (data[pos + 1] << 8) | data[pos + 2]
+        hashed = (((key * 0x9E3779B1) & 0xFFFFFFFF) >> (32 - _HASH_BITS)) & _HASH_MASK
+        check = head[hashed]
+        chain = 0
+        while check >= search_start and chain < _MAX_CHAIN:
+            last_idx = min(max_len + 1, pos - check, endpos - pos) - 1
+            idx = _match_length(data, check, pos, last_idx)
+            if idx > best_len:
+                best_len = idx
+                best_pos = check
+                if idx >= max_len:
+                    break
+            check = prev[check]
+            chain += 1
+    return best_pos, best_len, next_insert
+
+
+if _HAS_NUMBA:
+    _find_best_match = njit(cache=True, boundscheck=False)(_find_best_match)
+
+
 class LZ(object):
-    def __init__(self, reader):
-        handle = BinaryIO.reader(reader)
-        start = handle.tell()
-        raw_header = unpack('I', handle.read(4))[0]
+    header: LZHeader
+    data: bytes
+    handle: IOBytesHandler
+
+    def __init__(self, reader: IOHandler) -> None:
+        """
+        Decompresses the LZ77/LZSS file held by the reader (from its start).
+        The decompressed data is in `data`, and can be read from `handle`.
+
+        Args:
+            reader (IOHandler): Reader of the compressed file
+
+        Raises:
+            ValueError: If the compression flag is unknown
+        """
+        compressed = reader.getvalue_view()
+        raw_header, = _unpack_header(compressed[:4])
         self.header = LZHeader._make([raw_header&0xFF, raw_header>>8])
         if self.header.flag == COMPRESSION_LZSS:
             lz_ss = True
@@ -26,106 +206,101 @@ class LZ(object):
         else:
             raise ValueError('Invalid compression flag: {0}'
                              .format(self.header.flag))
-        out: list[bytes] = []
-        while len(out) < self.header.size:
-            flag = unpack('B', handle.read(1))[0]
-            for x in range(7, -1, -1):
-                if len(out) >= self.header.size:
-                    break
-                if not (flag >> x) & 0x1:
-                    r = handle.read(1)
-                    out.append(r)
-                    continue
-                head, = unpack('>H', handle.read(2))
-                if not lz_ss:
-                    count = ((head >> 12) & 0xF) + 3
-                    back = head & 0xFFF
-                else:
-                    ind = (head >> 12) & 0xF
-                    if not ind:
-                        tail = unpack('B', handle.read(1))[0]
-                        count = (head >> 4) + 0x11
-                        back = ((head & 0xF) << 8) | tail
-                    elif ind == 1:
-                        tail = unpack('>H', handle.read(2))[0]
-                        count = (((head & 0xFFF) << 4) | (tail >> 12)) + 0x111
-                        back = tail & 0xFFF
-                    else:
-                        count = ind + 1
-                        back = head & 0xFFF
-                cursz = len(out)
-                for y in range(count):
-                    out.append(out[cursz-back-1+y])
-        self.data = b"".join(out)
-        handle.seek(start)
-        handle.write(self.data)
-        handle.seek(start)
-        self.handle = handle
+        self.data = bytes(_lz_decode(compressed[4:], self.header.size, lz_ss))
+        self.handle = IOBytesHandler()
+        self.handle.write_bytes(self.data)
+        self.handle.seek(0)
 
     @staticmethod
     def is_lz(data):
-        return ord(data[0]) in (COMPRESSION_LZ77, COMPRESSION_LZSS)
+        return data[0] in (COMPRESSION_LZ77, COMPRESSION_LZSS)
 
 
 class LZCompress(object):
     """LZ77 Compression. Basic sliding window implementation
     """
-    def __init__(self, infile, outfile, compression=COMPRESSION_LZ77):
-        # Create the handle for the input file
-        infile_handle = BinaryIO.reader(infile)
-        start = infile_handle.tell()
-        data = array.array('B', infile_handle.read())
+    header: LZHeader
+    handle: IOHandler
+
+    def __init__(self, reader: IOHandler, writer: IOHandler, compression: int = COMPRESSION_LZ77,
+                 compression_level: int = 1) -> None:
+        """
+        Compresses the reader's value and writes it to the writer (at its
+        position). The writer is kept in `handle`.
 
-        # Create the handle for the output file
-        outfile_handle = BinaryIO.adapter(outfile)
+        Args:
+            reader (IOHandler): Reader of the data to compress
+            writer (IOHandler): Writer of the compressed file
+            compression (int, optional): Compression flag. Defaults to COMPRESSION_LZ77.
+            compression_level (int, optional): Compression level, lazy matching is used
+            from _LAZY_LEVEL. Defaults to 1.
+        """
+        data = array.array('B', reader.getvalue())
 
         # Write the flag to the output file
         self.header = LZHeader._make([compression, len(data)])
-        infile_handle.truncate(start)
-        infile_handle.seek(start)
-        outfile_handle.writeInt32(self.header.flag | (self.header.size << 8))
+        writer.write(StructModes.uint32, self.header.flag | (self.header.size << 8))
+
+        # The JIT compiled search needs NumPy arrays
+        search_data: Any
+        hash_head: Any
+        hash_prev: Any
+        if _HAS_NUMBA:
+            search_data = numpy.frombuffer(data, dtype=numpy.uint8).astype(numpy.int64)
+            hash_head = numpy.full(_HASH_MASK + 1, -1, dtype=numpy.int64)
+            hash_prev = numpy.full(len(data), -1, dtype=numpy.int64)
+        else:
+            search_data = data.tobytes()
+            hash_head = [-1] * (_HASH_MASK + 1)
+            hash_prev = [-1] * len(data)
+        next_insert = 0
 
-        out = array.array('B')
-        out.append(0)
-        out.extend(data[:4])
+        # Literals cost 9 bits, so the output never exceeds len(data) * 9 / 8
+        # plus a few flag bytes: it is allocated once and never grows
+        out = bytearray(len(data) + len(data) // 8 + 64)
+        out[1:5] = data[:4]
+        write_pos = 1 + len(data[:4])
         pos = 4
         endpos = len(data)
         search_start = 0
         max_len = 0x12
+        lazy = compression_level >= _LAZY_LEVEL
         control_bit = 4
         flag = 0
         flag_pos = 0
         while pos < endpos:
-            best_pos = None
-            best_len = 0
-            for check in range(search_start, pos):
-                for idx in range(0, min(max_len+1, pos-check, endpos-pos)):
-                    if data[check+idx] != data[pos+idx]:
-                        break
-                if idx >= best_len:
-                    best_len = idx
-                    best_pos = check
-                    if idx >= max_len:
-                        break
+            best_pos, best_len, next_insert = _find_best_match(search_data, pos, search_start, endpos, max_len,
+                                                               hash_head, hash_prev, next_insert)
+            # A match as long as its distance allows grows at the next position
+            # anyway, deferring it would only add a literal
+            if lazy and 3 <= best_len < min(max_len, pos - best_pos - 1):
+                # Emit a literal instead if the next position has a longer match,
+                # one byte longer only pays for the literal so it is not worth it
+                _, next_len, next_insert = _find_best_match(search_data, pos + 1, search_start, endpos, max_len,
+                                                            hash_head, hash_prev, next_insert)
+                if next_len > best_len + 1:
+                    best_len = 0
             control_bit -= 1
             if best_len < 3:
-                out.append(data[pos])
+                out[write_pos] = data[pos]
+                write_pos += 1
                 pos += 1
             else:
                 flag |= 1 << control_bit
                 head = (best_len-3) << 0xC
                 head |= pos-best_pos-1
-                out.append(head >> 8)
-                out.append(head & 0xFF)
+                out[write_pos] = head >> 8
+                out[write_pos + 1] = head & 0xFF
+                write_pos += 2
                 pos += best_len
             if control_bit <= 0:
                 if pos >= 0x400:
                     search_start = pos-0x400
                 control_bit = 8
                 out[flag_pos] = flag
-                flag_pos = len(out)
+                flag_pos = write_pos
                 flag = 0
-                out.append(0)
+                write_pos += 1
         out[flag_pos] = flag
-        outfile_handle.write(out.tobytes())
-        self.handle = infile_handle
+        writer.write_bytes(memoryview(out)[:write_pos])
+        self.handle = writer
@@ -11,10 +11,11 @@ class Singleton(type):
     _instances: dict[Any, Any] = {}
 
     def __call__(self, *args, **kwargs):
-        if self not in self._instances:
+        instance = self._instances.get(self)
+        if instance is None:
             instance = super().__call__(*args, **kwargs)
             self._instances[self] = instance
-        return self._instances[self]
+        return instance
 
 
 class EventManager(metaclass=Singleton):
@@ -24,11 +25,14 @@ class EventManager(metaclass=Singleton):
     will return the same instance.
     """
 
-    _registered_handlers: dict[str, list[Callable[[Event], None]]]
+    # Handlers are kept as keys of an insertion-ordered dict, to remove them in O(1)
+    _registered_handlers: dict[str, dict[Callable[[Event], None], None]]
+    _warned_events: set[str]
 
     
     def __init__(self) -> None:
         self._registered_handlers = {}
+        self._warned_events = set()
 
 
     def register_event_handler(self, event_name: str, event_handler: Callable[[Event], None]):
@@ -39,22 +43,21 @@ class EventManager(metaclass=Singleton):
             event_name (str): Name of the event
             event_handler (Callable[[Event], None]): Handler to execute when the event is fired
         """
-        if event_name in self._registered_handlers:
-            self._registered_handlers[event_name].append(event_handler)
-        else:
-            self._registered_handlers[event_name] = [event_handler]
+        self._registered_handlers.setdefault(event_name, {})[event_handler] = None
 
     
     def remove_event_handler(self, event_name: str, event_handler: Callable[[Event], None]):
         """
-        Removes the handler for an event identified by its name
+        Removes the handler for an event identified by its name. Does
+        nothing if the handler is not registered
 
         Args:
             event_name (str): Name of the event
             event_handler (Callable[[Event], None]): Handler to remove
         """
-        if event_name in self._registered_handlers:
-            self._registered_handlers[event_name].remove(event_handler)
+        handlers = self._registered_handlers.get(event_name)
+        if handlers is not None:
+            handlers.pop(event_handler, None)
 
     
     def remove_all_handlers(self, event_name: str):
@@ -75,12 +78,18 @@ class EventManager(metaclass=Singleton):
         Args:
             event (Event): Event to fire
         """
-        if event.name not in self._registered_handlers:
-            print(f'WARNING: Event {event.name:s} is not registered')
-        else: 
-            for event_handler in self._registered_handlers[event.name]:
-                event_handler(event)
-                
-                # Check if event has been cancelled
-                if event.cancelled:
-                    break
+        handlers = self._registered_handlers.get(event.name)
+        if handlers is None:
+            # Only warn once per event name
+            if event.name not in self._warned_events:
+                self._warned_events.add(event.name)
+                print(f'WARNING: Event {event.name:s} is not registered')
+            return
+
+        # Iterate over a snapshot, handlers may register or remove handlers
+        for event_handler in tuple(handlers):
+            event_handler(event)
+            
+            # Check if event has been cancelled
+            if event.cancelled:
+                return
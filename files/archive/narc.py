@@ -1,5 +1,7 @@
 import os
 import shutil
+from itertools import chain
+from struct import pack
 from typing import Any
 from rawdb.atomic.atomic_struct import AtomicStructBuilder, FieldTypes
 from rawdb.files.extension_enum import ExtensionEnum
@@ -12,6 +14,12 @@ from rawdb.interfaces.savable import Savable
 from rawdb.util.io import IOFileHandler
 
 
+# Magic ids of the NARC subsections
+_MAGIC_BTAF = 0x46415442 # b'BTAF'
+_MAGIC_BTNF = 0x464E5442 # b'BTNF'
+_MAGIC_GMIF = 0x46494D47 # b'GMIF'
+
+
 class BTAF(Editable, Loadable, Savable):
     magic_id: int # uint32
     section_size: int # uint32
@@ -24,7 +32,7 @@ class BTAF(Editable, Loadable, Savable):
         First subsection of the NARC
         """
         super().__init__()
-        self.magic_id = int.from_bytes(b'BTAF', 'little')
+        self.magic_id = _MAGIC_BTAF
         self.section_size = 12 # magic + section size + file number
         self.file_number = 0
         self.current_offset = 0
@@ -56,22 +64,15 @@ class BTAF(Editable, Loadable, Savable):
         self.magic_id = reader.read(StructModes.uint32)
         self.section_size = reader.read(StructModes.uint32)
         self.file_number = reader.read(StructModes.uint32)
-        self.files_offset = []
-        for _ in range(0, self.file_number):
-            start_offset = reader.read(StructModes.uint32)
-            end_offset = reader.read(StructModes.uint32)
-            self.files_offset.append([start_offset, end_offset])
-            self.current_offset = end_offset
+        offsets = [offset for offset, in StructModes.uint32.iter_unpack(reader.read_bytes(self.file_number * 8))]
+        self.files_offset = [offsets[index:index + 2] for index in range(0, len(offsets), 2)]
+        if self.files_offset:
+            self.current_offset = self.files_offset[-1][1]
     
 
     def save(self, writer: IOHandler) -> IOHandler:
-        writer.write(StructModes.uint32, self.magic_id)
-        writer.write(StructModes.uint32, self.section_size)
-        writer.write(StructModes.uint32, self.file_number)
-        for index in range(0, self.file_number):
-            start_offset, end_offset = self.files_offset[index]
-            writer.write(StructModes.uint32, start_offset)
-            writer.write(StructModes.uint32, end_offset)
+        offsets = chain.from_iterable(self.files_offset[:self.file_number])
+        writer.write_bytes(pack(f'<{3 + 2 * self.file_number}I', self.magic_id, self.section_size, self.file_number, *offsets))
 
         return writer
 
@@ -89,7 +90,7 @@ class BTNF(Editable, Loadable, Savable):
         Second subsection of the NARC: File Name Table
         """
         super().__init__()
-        self.magic_id = int.from_bytes(b'BTNF', 'little')
+        self.magic_id = _MAGIC_BTNF
         self.section_size = 16
         self.main_table = [(4, 0, 1)]
         self.sub_tables = {0: []}
@@ -187,9 +188,7 @@ class BTNF(Editable, Loadable, Savable):
                 pass
             elif type_length < 0x80:
                 # It's a file! 
-                file_name = bytearray()
-                for _ in range(0, type_length):
-                    file_name.append(reader.read(StructModes.uint8))
+                file_name = reader.read_bytes(type_length)
 
 
             elif type_length > 0x80:
@@ -197,31 +196,28 @@ class BTNF(Editable, Loadable, Savable):
         
 
     def save(self, writer: IOHandler) -> IOHandler:
-        writer.write(StructModes.uint32, self.magic_id)
-        writer.write(StructModes.uint32, self.section_size)
-
-        # Write directories
-        for (offset, first_file_position, parent_directory) in self.main_table:
-            writer.write(StructModes.uint32, offset)
-            writer.write(StructModes.uint16, first_file_position)
-            writer.write(StructModes.uint16, parent_directory)
+        # Write header and directories
+        writer.write_bytes(pack('<2I' + 'IHH' * len(self.main_table), self.magic_id, self.section_size,
+                                *chain.from_iterable(self.main_table)))
         
         # If has a nametable, write it
         if self.has_nametable:
+            parts: list[bytes] = []
             for sub_table in self.sub_tables.values():
                 for item in sub_table:
                     type_length = item[0]
                     name = item[1]
 
-                    writer.write(StructModes.uint8, type_length)
-                    for char in name:
-                        writer.write(StructModes.uint8, ord(char))
+                    parts.append(StructModes.uint8.pack(type_length))
+                    parts.append(name.encode('latin-1'))
 
                     # Check if directory
                     if type_length > 0x80:
                         # We know from here that there is a third item
                         directory_id = item[2] # type: ignore
-                        writer.write(StructModes.uint16, directory_id) # type: ignore
+                        parts.append(StructModes.uint16.pack(directory_id)) # type: ignore
+
+            writer.write_bytes(b''.join(parts))
 
         return writer
         
@@ -229,15 +225,15 @@ class BTNF(Editable, Loadable, Savable):
 class GMIF(Editable, Loadable, Savable):
     magic_id: int # uint32
     section_size: int # uint32
-    files: bytes 
+    files: bytes | bytearray
 
 
     def __init__(self) -> None:
         super().__init__()
-        self.magic_id = int.from_bytes(b'GMIF', 'little')
+        self.magic_id = _MAGIC_GMIF
         self.section_size = 8
-        self.files = b''
-        self.restrict('files', 'bytes_type', lambda value: isinstance(value, bytes))
+        self.files = bytearray()
+        self.restrict('files', 'bytes_type', lambda value: isinstance(value, (bytes, bytearray)))
 
     def define(self, builder: AtomicStructBuilder, *_: Any):
         builder.add_field('magic_id', FieldTypes.uint32_t)\
@@ -252,8 +248,13 @@ class GMIF(Editable, Loadable, Savable):
         Args:
             file (IOHandler): The file to add
         """
-        content = file.getvalue()
-        self.files += fill * offset + content
+        content = file.getvalue_view()
+        # Grow the files in place, loaded ones are bytes and are converted once
+        if not isinstance(self.files, bytearray):
+            self.files = bytearray(self.files)
+        if offset:
+            self.files += fill * offset
+        self.files += content
         self.section_size += offset + len(content)
 
 
@@ -296,7 +297,7 @@ class NARC(Editable, Loadable, Savable, Exportable):
         
 
     def add_file(self, file: IOHandler, offset: int = 0, file_name: str = '', parent_id: int = 0):
-        content = file.getvalue()
+        content = file.getvalue_view()
         self.btaf.add_file(len(content), offset)
         self.btnf.add_file(parent_id, file_name)
         self.gmif.add_file(file, offset)
@@ -327,18 +328,15 @@ class NARC(Editable, Loadable, Savable, Exportable):
         # Create directory
         os.mkdir(export_directory)
 
-        # Get full file content
-        files_content = self.gmif.files
+        # Get full file content, sliced without copies
+        files_content = memoryview(self.gmif.files)
         file_index = 0
         for start, end in self.btaf.files_offset:
             # Get file content and determine extension
             file_content = files_content[start:end]
-            if len(file_content) >= 4:
-                extension = ExtensionEnum.from_magic_bytes(file_content[0:4])
-            else:
-                extension = 'bin'
+            extension = ExtensionEnum.from_magic_bytes(file_content[0:4])
 
             # Open new file and write content
-            file_handler = IOFileHandler(os.path.join(export_directory, f'{export_name:s}_{file_index:d}.{extension:s}'), 'w')
-            file_handler.write_bytes(file_content)
+            with IOFileHandler(os.path.join(export_directory, f'{export_name:s}_{file_index:d}.{extension:s}'), 'w') as file_handler:
+                file_handler.write_bytes(file_content)
             file_index += 1
\ No newline at end of file
@@ -26,8 +26,17 @@ class ExtensionEnum(Enum):
     
 
     @classmethod
-    def from_magic_bytes(cls, magic_bytes: bytes) -> 'ExtensionEnum | None':
-        for c in cls:
-            if c.value[0] == magic_bytes:
-                return c.value[1]
-        return None
+    def from_magic_bytes(cls, magic_bytes: bytes | bytearray | memoryview) -> str:
+        """
+        Returns the file extension matching the magic bytes
+
+        Args:
+            magic_bytes (bytes | bytearray | memoryview): First 4 bytes of the file
+
+        Returns:
+            str: File extension, 'bin' if the magic bytes are unknown
+        """
+        return _EXTENSIONS_BY_MAGIC.get(bytes(magic_bytes), 'bin')
+
+
+_EXTENSIONS_BY_MAGIC = {member.magic_bytes: member.extension for member in ExtensionEnum}
@@ -1,7 +1,7 @@
 from typing import Any
 from rawdb.atomic.atomic_struct import AtomicStructBuilder, FieldTypes
 from rawdb.generic.editable import Editable
-from rawdb.interfaces.binary_io import IOHandler, StructModes
+from rawdb.interfaces.binary_io import IOHandler
 from rawdb.interfaces.loadable import Loadable
 from rawdb.interfaces.savable import Savable
 from rawdb.util.io import IOBytesHandler
@@ -51,17 +51,11 @@ class GenericHeader(Editable, Loadable, Savable):
         
     
     def load(self, reader: IOHandler) -> None:
-        self.magic_id = reader.read(StructModes.int32)
-        self.unused = reader.read(StructModes.uint32)
-        self.section_size = reader.read(StructModes.uint32)
-        self.header_size = reader.read(StructModes.uint16)
-        self.subsection_number = reader.read(StructModes.uint16)
+        self.magic_id, self.unused, self.section_size, self.header_size, \
+            self.subsection_number = reader.read_batch('<iIIHH')
     
 
     def save(self, writer: IOHandler) -> IOHandler:
-        writer.write(StructModes.uint32, self.magic_id)
-        writer.write(StructModes.uint32, self.unused)
-        writer.write(StructModes.uint32, self.section_size)
-        writer.write(StructModes.uint16, self.header_size)
-        writer.write(StructModes.uint16, self.subsection_number)
+        writer.write_batch('<IIIHH', self.magic_id, self.unused, self.section_size,
+                           self.header_size, self.subsection_number)
         return writer
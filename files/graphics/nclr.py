@@ -1,3 +1,4 @@
+from struct import pack
 from typing import Any
 from rawdb.atomic.atomic_struct import AtomicStructBuilder, FieldTypes
 from rawdb.files.extension_enum import ExtensionEnum
@@ -60,23 +61,13 @@ class TTLP(Editable, Loadable, Savable):
         self.colors_per_palette = reader.read(StructModes.uint32)
 
         colors_to_read = (self.section_size - 0x18) >> 1
-        self.palette_data = []
-        for _ in range(0, colors_to_read):
-            palette_color = NTFP()
-            palette_color.load(reader)
-            self.palette_data.append(palette_color)
+        self.palette_data = NTFP.load_many(reader, colors_to_read)
 
     
     def save(self, writer: IOHandler) -> IOHandler:
-        writer.write(StructModes.uint32, self.magic_id)
-        writer.write(StructModes.uint32, self.section_size)
-        writer.write(StructModes.uint32, self.palette_bit_depth)
-        writer.write(StructModes.uint32, self.padding)
-        writer.write(StructModes.uint32, self.palette_data_size)
-        writer.write(StructModes.uint32, self.colors_per_palette)
-
-        for ntfp in self.palette_data:
-            ntfp.save(writer)
+        writer.write_bytes(pack('<6I', self.magic_id, self.section_size, self.palette_bit_depth,
+                                self.padding, self.palette_data_size, self.colors_per_palette))
+        NTFP.save_many(writer, self.palette_data)
 
         return writer
 
@@ -105,28 +96,12 @@ class NCLR(Editable, Loadable, Savable):
         Returns:
             list[int]: palettes with their colors
         """
-        palettes = []
+        colors = [palette_color.palette_color for palette_color in self.ttlp.palette_data]
         if self.ttlp.palette_bit_depth == 4: # 8 bits depth
-            palette = []
-            for palette_color in self.ttlp.palette_data:
-                palette.append(palette_color.palette_color)
-            palettes.append(palette)
-                    
-        else: # 4 bits depth
-            index = 0
-            palette = []
-            for palette_color in self.ttlp.palette_data:
-                palette.append(palette_color.palette_color)
-                
-                index += 1
-                
-                # When 16 colors placed, reset the index and the palette
-                if index == 16:
-                    index = 0
-                    palettes.append(palette)
-                    palette = []
-
-        return palettes
+            return [colors]
+
+        # 4 bits depth, palettes of 16 colors (an incomplete last palette is dropped)
+        return [colors[index:index + 16] for index in range(0, len(colors) - 15, 16)]
 
     
     def load(self, reader: IOHandler) -> None:
@@ -1,10 +1,53 @@
-from typing import Any
+from struct import pack
+from typing import Any, TypeVar
 from rawdb.atomic.atomic_struct import AtomicStructBuilder, FieldTypes
 from rawdb.generic.editable import Editable
 from rawdb.interfaces.binary_io import IOHandler, StructModes
 from rawdb.interfaces.loadable import Loadable
 from rawdb.interfaces.savable import Savable
 
+_T = TypeVar('_T')
+
+
+def _load_many(cls: type[_T], reader: IOHandler, count: int, attribute: str, mode: StructModes) -> list[_T]:
+    """
+    Loads consecutive single field items with a single read
+
+    Args:
+        cls (type): Item's class
+        reader (IOHandler): Reader
+        count (int): Number of items to load
+        attribute (str): Item's field
+        mode (StructModes): Field's struct mode
+
+    Returns:
+        list: Loaded items
+    """
+    items = []
+    for value, in mode.iter_unpack(reader.read_bytes(count * mode.size)):
+        item = cls()
+        setattr(item, attribute, value)
+        items.append(item)
+    return items
+
+
+def _save_many(writer: IOHandler, items: list[Any], attribute: str, mode: StructModes) -> IOHandler:
+    """
+    Saves consecutive single field items with a single write
+
+    Args:
+        writer (IOHandler): Writer
+        items (list): Items to save
+        attribute (str): Item's field
+        mode (StructModes): Field's struct mode
+
+    Returns:
+        IOHandler: Writer
+    """
+    # Modes are little endian, only their type character is repeated
+    writer.write_bytes(pack(f'<{len(items)}{mode.format[-1]}', *[getattr(item, attribute) for item in items]))
+    return writer
+
 
 class NTFP(Editable, Loadable, Savable):
     palette_color: int # uint16
@@ -25,6 +68,36 @@ class NTFP(Editable, Loadable, Savable):
     def save(self, writer: IOHandler) -> IOHandler:
         writer.write(StructModes.uint16, self.palette_color)
         return writer
+
+
+    @classmethod
+    def load_many(cls, reader: IOHandler, count: int) -> list['NTFP']:
+        """
+        Loads consecutive palette colors with a single read
+
+        Args:
+            reader (IOHandler): Reader
+            count (int): Number of palette colors to load
+
+        Returns:
+            list[NTFP]: Loaded palette colors
+        """
+        return _load_many(cls, reader, count, 'palette_color', StructModes.uint16)
+
+
+    @staticmethod
+    def save_many(writer: IOHandler, items: list['NTFP']) -> IOHandler:
+        """
+        Saves consecutive palette colors with a single write
+
+        Args:
+            writer (IOHandler): Writer
+            items (list[NTFP]): Palette colors to save
+
+        Returns:
+            IOHandler: Writer
+        """
+        return _save_many(writer, items, 'palette_color', StructModes.uint16)
     
 
 class NTFT(Editable, Loadable, Savable):
@@ -45,6 +118,36 @@ class NTFT(Editable, Loadable, Savable):
     def save(self, writer: IOHandler) -> IOHandler:
         writer.write(StructModes.uint8, self.tile_data)
         return writer
+
+
+    @classmethod
+    def load_many(cls, reader: IOHandler, count: int) -> list['NTFT']:
+        """
+        Loads consecutive tiles with a single read
+
+        Args:
+            reader (IOHandler): Reader
+            count (int): Number of tiles to load
+
+        Returns:
+            list[NTFT]: Loaded tiles
+        """
+        return _load_many(cls, reader, count, 'tile_data', StructModes.uint8)
+
+
+    @staticmethod
+    def save_many(writer: IOHandler, items: list['NTFT']) -> IOHandler:
+        """
+        Saves consecutive tiles with a single write
+
+        Args:
+            writer (IOHandler): Writer
+            items (list[NTFT]): Tiles to save
+
+        Returns:
+            IOHandler: Writer
+        """
+        return _save_many(writer, items, 'tile_data', StructModes.uint8)
     
 
 class NTFS(Editable, Loadable, Savable):
@@ -65,3 +168,33 @@ class NTFS(Editable, Loadable, Savable):
     def save(self, writer: IOHandler) -> IOHandler:
         writer.write(StructModes.uint16, self.screen_data)
         return writer
+
+
+    @classmethod
+    def load_many(cls, reader: IOHandler, count: int) -> list['NTFS']:
+        """
+        Loads consecutive screen entries with a single read
+
+        Args:
+            reader (IOHandler): Reader
+            count (int): Number of screen entries to load
+
+        Returns:
+            list[NTFS]: Loaded screen entries
+        """
+        return _load_many(cls, reader, count, 'screen_data', StructModes.uint16)
+
+
+    @staticmethod
+    def save_many(writer: IOHandler, items: list['NTFS']) -> IOHandler:
+        """
+        Saves consecutive screen entries with a single write
+
+        Args:
+            writer (IOHandler): Writer
+            items (list[NTFS]): Screen entries to save
+
+        Returns:
+            IOHandler: Writer
+        """
+        return _save_many(writer, items, 'screen_data', StructModes.uint16)
@@ -1,27 +1,72 @@
 from abc import ABCMeta
 import os
+import shutil
 import time
-from typing import Any
+from typing import IO, Any
 from zipfile import ZipFile, ZipInfo
 
 from rawdb.util import natsort_key
 
+# Size of the blocks used when streaming zip members
+_COPY_BUFFER_SIZE = 1 << 20
+
+
+class _ZipMember(object):
+    """
+    Member of an opened zip archive, only read when accessed
+    """
+    __slots__ = ('archive', 'info')
+
+    archive: ZipFile
+    info: ZipInfo
+
+
+    def __init__(self, archive: ZipFile, info: ZipInfo) -> None:
+        self.archive = archive
+        self.info = info
+
+
+    def open(self) -> IO[bytes]:
+        """
+        Opens the member as a stream
+
+        Returns:
+            IO[bytes]: Member's stream
+        """
+        return self.archive.open(self.info)
+
+
+    def read(self) -> bytes:
+        """
+        Reads the whole member
+
+        Returns:
+            bytes: Member's content
+        """
+        return self.archive.read(self.info)
+
+
 class Archive(object, metaclass=ABCMeta):
     files: list[Any]
     extension: str
     _external_attr: int
+    _source: ZipFile | None
 
 
     def __init__(self) -> None:
         self.files = []
         self.extension = '.bin'
         self._external_attr = 33152 << 16 # WHY??????
+        self._source = None
 
 
     @classmethod
     def from_zip(cls, archive_name: str, mode: str ='r') -> 'Archive':
         """
-        Creates a new Archive object from a zip archive
+        Creates a new Archive object from a zip archive. In 'r' mode, 
+        members are only read when accessed, so the zip archive stays 
+        opened until `close()` or `reset()` is called. Other modes read
+        every member at once.
 
         Args:
             archive_name (str): Archive's name
@@ -32,12 +77,26 @@ class Archive(object, metaclass=ABCMeta):
             return cls()
 
         archive_obj = cls()
-        with ZipFile(archive_name, mode) as archive:
-            for name in sorted(archive.namelist(), key=natsort_key):
-                archive_obj.add(archive.read(name))
+        if mode != 'r':
+            # A zip archive opened for writing can't stay opened
+            with ZipFile(archive_name, mode) as archive:
+                for name in sorted(archive.namelist(), key=natsort_key):
+                    archive_obj.add(archive.read(name))
+            return archive_obj
+
+        archive = ZipFile(archive_name, 'r')
+        members = sorted(archive.infolist(), key=lambda info: natsort_key(info.filename))
+        if not members:
+            archive.close()
+            return archive_obj
+
+        archive_obj._source = archive
+        for info in members:
+            archive_obj.add(_ZipMember(archive, info))
 
         return archive_obj
 
+
     def get(self, index: int) -> Any:
         """
         Gets the stored item at a specific index
@@ -48,7 +107,30 @@ class Archive(object, metaclass=ABCMeta):
         Returns:
             Any: Stored item
         """
-        return self.files[index]
+        data = self.files[index]
+        if isinstance(data, _ZipMember):
+            data = data.read()
+            self.files[index] = data
+        return data
+
+
+    def iter_streams(self):
+        """
+        Iterates over the stored items as streams, without reading
+        zip members in memory. Items that are not zip members are
+        yielded as they are.
+
+        Yields:
+            tuple[str, Any]: Item's file name and stream (or item)
+        """
+        extension = self.extension
+        for index, data in enumerate(self.files):
+            filename = f'{index:d}{extension:s}'
+            if isinstance(data, _ZipMember):
+                with data.open() as stream:
+                    yield filename, stream
+            else:
+                yield filename, data
     
 
     def add(self, data: Any) -> None:
@@ -72,11 +154,25 @@ class Archive(object, metaclass=ABCMeta):
         self.files[index] = data
 
 
+    def close(self) -> None:
+        """
+        Closes the zip archive the items were imported from. Items 
+        that were not accessed before are read first.
+        """
+        if self._source is not None:
+            for index, data in enumerate(self.files):
+                if isinstance(data, _ZipMember):
+                    self.files[index] = data.read()
+            self._source.close()
+            self._source = None
+
+
     def reset(self) -> None:
         """
-        Resets the archive
+        Resets the archive, removing all items
         """
-        self.__init__()
+        self.files.clear()
+        self.close()
 
 
     def delete(self, index: int = -1) -> Any:
@@ -105,18 +201,29 @@ class Archive(object, metaclass=ABCMeta):
             # TODO Raise an error? 
             return
 
+        # Writing over the imported zip archive would truncate it 
+        # before its members are read, so they are read first
+        if self._source is not None and self._source.filename is not None \
+                and os.path.exists(archive_name) and os.path.samefile(archive_name, self._source.filename):
+            self.close()
+
         with ZipFile(archive_name, mode) as archive:
-            # For each element create a new file 
-            for index in range(0, len(self.files)):
-                filename = f'{index:d}{self.extension:s}'
-                date_time = time.localtime(time.time())[:6]
+            # Same date and compression for every file
+            date_time = time.localtime(time.time())[:6]
+            compress_type = archive.compression
 
+            # For each element create a new file 
+            for filename, data in self.iter_streams():
                 zipinfo = ZipInfo(filename=filename, date_time=date_time)
-                zipinfo.compress_type = archive.compression
+                zipinfo.compress_type = compress_type
                 zipinfo.external_attr = self._external_attr
 
-                # Write file
-                archive.writestr(zipinfo, self.files[index])
+                # Write file, streams (zip members) are copied by blocks
+                if hasattr(data, 'read'):
+                    with archive.open(zipinfo, 'w', force_zip64=True) as handle:
+                        shutil.copyfileobj(data, handle, _COPY_BUFFER_SIZE)
+                else:
+                    archive.writestr(zipinfo, data)
 
 
     def export_dir(self, dir_name: str) -> None:
@@ -129,14 +236,21 @@ class Archive(object, metaclass=ABCMeta):
         if not os.path.exists(dir_name):
             os.makedirs(dir_name)
         
-        for index in range(0, len(self.files)):
-            filename = f'{index:d}{self.extension:s}'
-            with open(os.path.join(dir_name, filename), 'w') as handle:
-                handle.write(self.files[index])
+        # Directory prefix joined once
+        prefix = os.path.join(dir_name, '')
+        for filename, data in self.iter_streams():
+            path = prefix + filename
+            if hasattr(data, 'read'):
+                # Stream (zip member), copied by blocks
+                with open(path, 'wb') as handle:
+                    shutil.copyfileobj(data, handle, _COPY_BUFFER_SIZE)
+            else:
+                with open(path, 'w' if isinstance(data, str) else 'wb') as handle:
+                    handle.write(data)
 
 
     def __iter__(self):
-        return iter(self.files)
+        return (self.get(index) for index in range(0, len(self.files)))
     
 
     def __len__(self):
@@ -1,5 +1,5 @@
-from typing import Any
-from rawdb.atomic.atomic_struct import AtomicStructBuilder, FieldTypes
+from typing import Any, Iterable
+from rawdb.atomic.atomic_struct import AtomicStructBuilder, FieldType, FieldTypes
 from rawdb.generic.editable import Editable
 from rawdb.generic.restriction import Restriction
 
@@ -8,8 +8,9 @@ class Collection2d(Editable):
     entries: list[Any]
     width: int
     height: int
+    _item_restriction: Restriction
 
-    def __init__(self, _type: FieldTypes, width: int, height: int) -> None:
+    def __init__(self, _type: FieldType, width: int, height: int) -> None:
         """
         Creates a 2D collection (2D matrix) of the specified type, width and height.
         It is implemented to only verify values when you access the object like a list.
@@ -22,23 +23,41 @@ class Collection2d(Editable):
 
         Output: 
             [[0, 0, 0], [0, 2, 0], [0, 0, 0], [0, 0, 0]]
+
+        Many items can be set in `batch()`, validating the whole collection once:
+        >>> with example_matrix.batch():
+        >>> ... for x in range(0, 3):
+        >>> ...     example_matrix[x, 0] = x
             
         Args:
-            _type (FieldTypes): Matrix's type
+            _type (FieldType): Matrix's type
             width (int): Matrix's width
             height (int): Matrix's height
         """
         super().__init__(_type, width, height)
 
+        # Restriction of a single modified item: a value, or a line for chars.
+        # This is not an attribute of the struct, so it bypasses Editable.
+        item_restriction = Restriction('entries')
+        object.__setattr__(self, '_item_restriction', item_restriction)
+
         # Restrict further the list
         if _type != FieldTypes.char:
+            # Bound once, the validators do not look them up for every value
+            python_type = _type.python_type
+            min_value = _type.min
+            max_value = _type.max
+
+            item_restriction.restrict('items_type', lambda value: isinstance(value, python_type))
+            item_restriction.restrict('items_value', lambda value: min_value <= value <= max_value)
+
             # Type
             self.restrict('entries', 'items_type', lambda array: all(
-                all(isinstance(value, _type.python_type) for value in subarray) for subarray in array)
+                isinstance(value, python_type) for subarray in array for value in subarray)
             )
-            # Value
+            # Value, types are checked before so lines can be compared with min and max
             self.restrict('entries', 'items_value', lambda array: all(
-                all(_type.min <= value <= _type.max for value in subarray) for subarray in array)
+                not subarray or (min_value <= min(subarray) and max(subarray) <= max_value) for subarray in array)
             )
             # Size
             self.restrict('entries', 'subarray_size', lambda array: all(
@@ -46,6 +65,9 @@ class Collection2d(Editable):
             )
 
         else:
+            item_restriction.restrict('items_type', lambda value: isinstance(value, str))
+            item_restriction.restrict('items_size', lambda value: len(value) == width - 1)
+
             # Type
             self.restrict('entries', 'items_type', lambda array: all(isinstance(value, str) for value in array))
             # Size (char* finishes by '\0')
@@ -54,7 +76,7 @@ class Collection2d(Editable):
         self.validate()
 
 
-    def define(self, builder: AtomicStructBuilder, args: tuple[FieldTypes, int, int]) -> None:
+    def define(self, builder: AtomicStructBuilder, args: tuple[FieldType, int, int]) -> None:
         builder.add_array('entries', args[0], dimension=2, lengths=(args[1], args[2]))
 
 
@@ -63,14 +85,19 @@ class Collection2d(Editable):
     
 
     def __setitem__(self, key: tuple[int, int], value: Any):
+        # Only the modified item is validated, before being set
         sublist = self.entries[key[0]]
         if isinstance(sublist, str):
-            strlist = list(sublist)
-            strlist[key[1]] = value
-            self.entries[key[0]] = "".join(strlist)
+            # Normalizes negative indexes and raises IndexError like a list
+            index = range(len(sublist))[key[1]]
+            line = sublist[:index] + value + sublist[index + 1:]
+            if not self._batch_depth:
+                self._item_restriction.validate(value=line)
+            self.entries[key[0]] = line
         else:
+            if not self._batch_depth:
+                self._item_restriction.validate(value=value)
             sublist[key[1]] = value
-        self.validate()
 
 
     def fill(self, value: Any, x: int, y: int, width: int, height: int):
@@ -84,9 +111,24 @@ class Collection2d(Editable):
             width (int): Region's width
             height (int): Region's height
         """
-        for sub_y in range(y, y+height):
-            for sub_x in range(x, x+width):
-                self[sub_x, sub_y] = value
+        if height <= 0:
+            return
+
+        # Set each line with a slice of the same values, then validate once
+        values: Any = None
+        for sub_x in range(x, x+width):
+            sublist = self.entries[sub_x]
+            if not (0 <= y and y + height <= len(sublist)):
+                raise IndexError('Region is out of the collection')
+
+            if values is None:
+                values = value * height if isinstance(sublist, str) else [value] * height
+
+            if isinstance(sublist, str):
+                self.entries[sub_x] = sublist[:y] + values + sublist[y+height:]
+            else:
+                sublist[y:y+height] = values
+        self.validate()
 
 
     def fill_rect(self, value: Any, x1: int, y1: int, x2: int, y2: int):
@@ -111,7 +153,7 @@ class SizedCollection(Editable):
     entries: str | list[Any]
     resizable: bool
 
-    def __init__(self, _type: FieldTypes, length: int, resizable: bool = True) -> None:
+    def __init__(self, _type: FieldType, length: int, resizable: bool = True) -> None:
         """
         Creates a new 1D Collection with a dynamic size (yes, it is possible with AtomicStructs!).
         It is implemented to verify values when you access this object like a list.
@@ -127,24 +169,22 @@ class SizedCollection(Editable):
         >>> example_array.append(5)
         >>> print(example_array)
         Args:
-            _type (FieldTypes): _description_
+            _type (FieldType): _description_
             length (int): _description_
             resizable (bool, optional): _description_. Defaults to True.
         """
         super().__init__(_type, resizable)
 
         # Add size restriction
-        restriction = self.keys['entries'][1]
-        if isinstance(restriction, Restriction):
-            if _type == FieldTypes.char:
-                self.entries = '\0' * (length - 1)
-                restriction.restrict('field_size', lambda string: len(string) == length - 1)
-            else:
-                self.entries = [_type.min] * length
-                restriction.restrict('field_size', lambda string: len(string) == length)
+        if _type == FieldTypes.char:
+            self.entries = '\0' * (length - 1)
+            self.restrict('entries', 'field_size', lambda string: len(string) == length - 1)
+        else:
+            self.entries = [_type.min] * length
+            self.restrict('entries', 'field_size', lambda string: len(string) == length)
 
 
-    def define(self, builder: AtomicStructBuilder, args: tuple[FieldTypes, bool]) -> None:
+    def define(self, builder: AtomicStructBuilder, args: tuple[FieldType, bool]) -> None:
         builder.add_pointer_field('entries', args[0])
         builder.add_field('resizable', FieldTypes.bool, default=args[1])
 
@@ -167,27 +207,25 @@ class SizedCollection(Editable):
             # If already the good length, do nothing
             if length != old_length:
                 # Change restriction to the new length
-                restriction = self.keys['entries'][1]
-                if isinstance(restriction, Restriction):
+                if isinstance(self.entries, str):
+                    self.restrict('entries', 'field_size', lambda array: len(array) == length - 1)
+                else:
+                    self.restrict('entries', 'field_size', lambda array: len(array) == length)
+
+                # Change array size
+                if length > old_length:
+                    # If bigger, then add new elements of the array (add the first element as value)
+                    value = self.entries[0]
                     if isinstance(self.entries, str):
-                        restriction.restrict('field_size', lambda array: len(array) == length - 1)
+                        self.entries += value * (length - old_length)
                     else:
-                        restriction.restrict('field_size', lambda array: len(array) == length)
-
-                    # Change array size
-                    if length > old_length:
-                        # If bigger, then add new elements of the array (add the first element as value)
-                        value = self.entries[0]
-                        if isinstance(self.entries, str):
-                            self.entries += value * (length - old_length)
-                        else:
-                            self.entries += [value] * (length - old_length)
+                        self.entries += [value] * (length - old_length)
+                else:
+                    # If smaller, then remove elements of the array
+                    if isinstance(self.entries, str):
+                        self.entries = self.entries[:length - 1]
                     else:
-                        # If smaller, then remove elements of the array
-                        if isinstance(self.entries, str):
-                            self.entries = self.entries[:length - 1]
-                        else:
-                            self.entries = self.entries[:length]
+                        self.entries = self.entries[:length]
 
 
     def append(self, value: Any) -> None:
@@ -211,6 +249,32 @@ class SizedCollection(Editable):
                 self.__setitem__(length, value)
 
 
+    def extend(self, values: Iterable[Any]) -> None:
+        """
+        Appends many values to the array, resizing it and validating it
+        only once rather than for each value
+
+        Args:
+            values (Iterable[Any]): New values to append
+        """
+        if self.resizable:
+            entries: str | list[Any]
+            if isinstance(self.entries, str):
+                entries = self.entries + ''.join(values)
+                length = len(entries) + 1
+            else:
+                entries = self.entries + list(values)
+                length = len(entries)
+
+            with self.batch():
+                # Change restriction to the new length
+                if isinstance(entries, str):
+                    self.restrict('entries', 'field_size', lambda array: len(array) == length - 1)
+                else:
+                    self.restrict('entries', 'field_size', lambda array: len(array) == length)
+                self.entries = entries
+
+
     def pop(self) -> Any:
         """
         Retreives and remove the last value of the array
@@ -237,12 +301,13 @@ class SizedCollection(Editable):
 
     def __setitem__(self, key: int, value: Any) -> None:
         if isinstance(self.entries, str):
-            strlist = list(self.entries)
-            strlist[key] = value
-            self.entries = "".join(strlist)
+            # Normalizes negative indexes and raises IndexError like a list
+            index = range(len(self.entries))[key]
+            # Setting the attribute already validates
+            self.entries = self.entries[:index] + value + self.entries[index + 1:]
         else:
             self.entries[key] = value
-        self.validate()
+            self.validate()
 
 
     def __len__(self):
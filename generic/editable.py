@@ -1,13 +1,97 @@
 
 from abc import ABCMeta, abstractmethod
-from collections import OrderedDict
-from typing import Any, Callable
+from contextlib import contextmanager
+from functools import cache, lru_cache
+from itertools import repeat
+from typing import Any, Callable, ClassVar, Iterator
 
 from rawdb.atomic import AtomicStructField
 from rawdb.atomic.atomic_struct import AtomicArrayField, AtomicDataField, AtomicField, AtomicFieldPointer, AtomicStructBuilder, FieldTypes
 from rawdb.event import INSERT_EVENT_NAME, INVALID_EVENT_NAME, REMOVE_EVENT_NAME, SET_EVENT_NAME
 from rawdb.generic.restriction import Restriction
 
+# Number of class and define arguments pairs whose struct is kept, the least
+# recently used ones are dropped (collections of many sizes, for example)
+_STRUCT_CACHE_SIZE = 256
+
+
+@lru_cache(maxsize=_STRUCT_CACHE_SIZE)
+def _struct_template(cls: type['Editable'], args: tuple[Any, ...]) -> tuple[AtomicStructField, tuple[dict[str, Any], dict[str, Restriction | None]] | None]:
+    """
+    Defines the struct of an Editable class with the define arguments, and
+    registers its fields once to be copied by the instances.
+
+    Args:
+        cls (type[Editable]): Editable class
+        args (tuple[Any, ...]): Define arguments, must be hashable
+
+    Returns:
+        tuple[AtomicStructField, tuple[dict[str, Any], dict[str, Restriction | None]] | None]: 
+        The struct and its registered fields (None if they can't be copied)
+    """
+    return cls._build_template(args)
+
+
+def _copy_value(value: Any) -> Any:
+    """
+    Copies a registered field value. Values are immutable, or lists (of lists)
+    of immutable values.
+
+    Args:
+        value (Any): Field value
+
+    Returns:
+        Any: A copy of the value, sharing no list with it
+    """
+    if isinstance(value, list):
+        if value and isinstance(value[0], list):
+            return [_copy_value(sub_value) for sub_value in value]
+        return value[:]
+    return value
+
+
+# Validators shared by all restrictions, instead of a new lambda per field
+def _is_str(value: Any) -> bool:
+    return isinstance(value, str)
+
+
+def _is_list(value: Any) -> bool:
+    return isinstance(value, list)
+
+
+def _is_bool(value: Any) -> bool:
+    return isinstance(value, bool)
+
+
+@cache
+def _instance_of(python_type: type) -> Callable[[Any], bool]:
+    def validator(value: Any) -> bool:
+        return isinstance(value, python_type)
+    return validator
+
+
+@cache
+def _all_instances_of(python_type: type) -> Callable[[Any], bool]:
+    def validator(array: Any) -> bool:
+        # Checked at C level, without a generator frame per element
+        return all(map(isinstance, array, repeat(python_type)))
+    return validator
+
+
+@cache
+def _has_length(length: int) -> Callable[[Any], bool]:
+    def validator(value: Any) -> bool:
+        return len(value) == length
+    return validator
+
+
+@cache
+def _in_range(min_value: Any, max_value: Any) -> Callable[[Any], bool]:
+    def validator(value: Any) -> bool:
+        return min_value <= value <= max_value
+    return validator
+
+
 class Editable(object, metaclass=ABCMeta):
     """
     Creates an editable object based on an AtomicStruct.
@@ -16,7 +100,16 @@ class Editable(object, metaclass=ABCMeta):
 
     TODO Add events
     """
-    keys: dict[str, tuple[Any, Restriction | None]]
+    _restrictions: dict[str, Restriction | None]
+    # Number of nested `batch()` contexts, modifications are validated if 0
+    _batch_depth: int = 0
+    # Start of the AttributeError message, formatted once per class
+    _missing_attribute: ClassVar[str] = '\'Editable\' object has no attribute '
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        cls._missing_attribute = f'\'{cls.__name__}\' object has no attribute '
+
 
     def __init__(self, *args: Any) -> None:
         """
@@ -27,22 +120,65 @@ class Editable(object, metaclass=ABCMeta):
         Args:
             *args (Any): Arguments to pass to the define method 
         """
-        self.keys = OrderedDict()
-        
-        # Define struct using the abstract method
-        builder = AtomicStructBuilder()
-        self.define(builder, args)
-        struct = builder.build('struct')
+        # Define struct using the abstract method, only once per class and arguments
+        try:
+            cached = _struct_template(type(self), args)
+        except TypeError:
+            # Unhashable arguments, the struct can't be cached
+            cached = None
+
+        if cached is not None and cached[1] is not None:
+            # Fields are registered the same way for every instance: copy
+            # those of the template instead
+            # Restrictions are shared until restricted further by `restrict()`
+            values, restrictions = cached[1]
+            object.__setattr__(self, '_restrictions', restrictions.copy())
+            self.__dict__.update({name: _copy_value(value) for name, value in values.items()})
+            return
+
+        # Field values are stored as instance attributes, to be read without
+        # any Python call, and written through __setattr__ that validates them
+        object.__setattr__(self, '_restrictions', {})
+        if cached is None:
+            builder = AtomicStructBuilder()
+            self.define(builder, args)
+            struct = builder.build('struct')
+        else:
+            struct = cached[0]
 
         # Add restrictions for each field
         self.__register_fields(fields=struct.fields)
 
+
+    @classmethod
+    def _build_template(cls, args: tuple[Any, ...]) -> tuple[AtomicStructField, tuple[dict[str, Any], dict[str, Restriction | None]] | None]:
+        """
+        Defines the struct with the define arguments and registers its 
+        fields on a prototype, which is then copied as a template.
+
+        Args:
+            args (tuple[Any, ...]): Define arguments
+
+        Returns:
+            tuple[AtomicStructField, tuple[dict[str, Any], dict[str, Restriction | None]] | None]: 
+            The struct and its registered fields (None if they can't be copied)
+        """
+        prototype = cls.__new__(cls)
+        object.__setattr__(prototype, '_restrictions', {})
+        builder = AtomicStructBuilder()
+        prototype.define(builder, args)
+        struct = builder.build('struct')
+        prototype.__register_fields(fields=struct.fields)
+
+        return struct, prototype.__fields_template()
+
     
     @classmethod
     def from_struct(cls, struct: AtomicStructField) -> 'Editable':
         """
         Creates a new Editable from a struct. Needs to declare this to 
-        "bypass" the abstract method.
+        "bypass" the abstract method: `define()` is not called, the
+        fields are only those of the struct.
 
         Args:
             struct (AtomicStructField): Struct to use
@@ -50,12 +186,59 @@ class Editable(object, metaclass=ABCMeta):
         Returns:
             Editable: An editable of the same type than the calling class
         """
-        editable = cls()
+        editable = cls.__new__(cls)
+        object.__setattr__(editable, '_restrictions', {})
         editable.__register_fields(fields=struct.fields)
 
         return editable
 
 
+    def __fields_template(self) -> tuple[dict[str, Any], dict[str, Restriction | None]] | None:
+        """
+        Copies the freshly registered fields, to be copied again by the
+        instances of the same class and arguments.
+
+        Returns:
+            tuple[dict[str, Any], dict[str, Restriction | None]] | None: The copied
+            values and restrictions, or None if a field is an Editable, which can't be copied
+        """
+        values = {}
+        restrictions: dict[str, Restriction | None] = {}
+        for name, restriction in self._restrictions.items():
+            value = self.__dict__[name]
+            if isinstance(value, Editable):
+                return None
+            if restriction is not None:
+                # Compiled once here rather than by every instance
+                restriction = restriction.copy()
+                restriction.compile()
+                restriction.shared = True
+            values[name] = _copy_value(value)
+            restrictions[name] = restriction
+        return values, restrictions
+
+
+    @property
+    def keys(self) -> dict[str, tuple[Any, Restriction | None]]:
+        """
+        Fields' values and restrictions, by name. This is a new dict,
+        modifying it does not modify the fields. The restrictions are 
+        those of this instance only, restricting them does not restrict
+        the other instances.
+
+        Returns:
+            dict[str, tuple[Any, Restriction | None]]: Value and restriction of each field
+        """
+        restrictions = self._restrictions
+        for name, restriction in restrictions.items():
+            if restriction is not None and restriction.shared:
+                # Other instances use it, give a copy of it
+                restrictions[name] = restriction.copy()
+
+        values = self.__dict__
+        return {name: (values[name], restriction) for name, restriction in restrictions.items()}
+
+
     @abstractmethod
     def define(self, builder: AtomicStructBuilder, args: Any):
         """
@@ -92,24 +275,28 @@ class Editable(object, metaclass=ABCMeta):
         pass
 
 
+    def __add_field(self, name: str, value: Any, restriction: Restriction | None) -> None:
+        self.__dict__[name] = value
+        self._restrictions[name] = restriction
+
+
     def __register_fields(self, fields: tuple[AtomicField, ...]):
+        # Dispatch on the field's exact type, one dict lookup per field
+        handlers = Editable._FIELD_HANDLERS
         for field in fields:
-            # Check if field is a struct. In that case, we create a new Editable
-            if isinstance(field, AtomicStructField):
-                sub_struct = Editable.from_struct(field)
-                self.keys[field.name] = (sub_struct, None)
-
-            # If field is an array, then create a list and restrict length
-            elif isinstance(field, AtomicArrayField):
-                self.__register_array_field(array_field=field)
+            handler = handlers.get(type(field))
+            if handler is None:
+                # Subclass of a field type, use the handler of its closest parent
+                handler = next((handlers[parent] for parent in type(field).__mro__ if parent in handlers), None)
+                if handler is None:
+                    continue
+            handler(self, field)
 
-            # If field is a pointer, do like for an array BUT do not restrict the length
-            elif isinstance(field, AtomicFieldPointer):
-                self.__register_pointer_field(pfield=field)
 
-            # Else just treat it like a field:
-            elif isinstance(field, AtomicDataField):
-                self.__register_data_field(data_field=field)
+    def __register_struct_field(self, struct_field: AtomicStructField):
+        # Field is a struct: we create a new Editable
+        sub_struct = _StructEditable.from_struct(struct_field)
+        self.__add_field(struct_field.name, sub_struct, None)
 
 
     def __register_array_field(self, array_field: AtomicArrayField):
@@ -134,23 +321,23 @@ class Editable(object, metaclass=ABCMeta):
         # If no dimension, then like a pointer
         if array_field.width == 0:
             if field_type == str:
-                restriction.restrict('field_type', lambda value: isinstance(value, str))
-            if field_type is not None:
-                restriction.restrict('field_type', lambda arr: all(isinstance(value, field_type) for value in arr))
+                restriction.restrict('field_type', _is_str)
+            elif field_type is not None:
+                restriction.restrict('field_type', _all_instances_of(field_type))
                 value = [value]
 
         # One dimension, then has a size
         elif array_field.width == 1:
             if field_type == str:
                 # Remember that the last char of a string is always '\0'
-                restriction.restrict('field_type', lambda value: isinstance(value, str))
-                restriction.restrict('field_size', lambda value: len(value) == array_field.lengths[0] - 1)
+                restriction.restrict('field_type', _is_str)
+                restriction.restrict('field_size', _has_length(array_field.lengths[0] - 1))
                 value = '\0' * (array_field.lengths[0] - 1)
             else:
                 if field_type is not None:
-                    restriction.restrict('field_type', lambda arr: all(isinstance(value, field_type) for value in arr))
+                    restriction.restrict('field_type', _all_instances_of(field_type))
                 value = [value for _ in range(0, array_field.lengths[0])]
-                restriction.restrict('field_size', lambda value: len(value) == array_field.lengths[0])
+                restriction.restrict('field_size', _has_length(array_field.lengths[0]))
             
         
         else:
@@ -162,10 +349,10 @@ class Editable(object, metaclass=ABCMeta):
                 value = self.create_ndarray(list(array_field.lengths), value)
             
             # Just add restriction to the first step
-            restriction.restrict('field_type', lambda value: isinstance(value, list))
-            restriction.restrict('field_size', lambda value: len(value) == array_field.lengths[-1])
+            restriction.restrict('field_type', _is_list)
+            restriction.restrict('field_size', _has_length(array_field.lengths[-1]))
 
-        self.keys[array_field.name] = (value, restriction)
+        self.__add_field(array_field.name, value, restriction)
 
 
     def __register_pointer_field(self, pfield: AtomicFieldPointer):
@@ -178,32 +365,32 @@ class Editable(object, metaclass=ABCMeta):
             field_type = None
 
         if field_type == str:
-            restriction.restrict('field_type', lambda value: isinstance(value, str))
+            restriction.restrict('field_type', _is_str)
             value = ''
         elif isinstance(pfield.atomic_data_field, AtomicArrayField):
-            restriction.restrict('field_type', lambda value: isinstance(value, list))
+            restriction.restrict('field_type', _is_list)
         elif field_type is not None:
-            restriction.restrict('field_type', lambda arr: all(isinstance(value, field_type) for value in arr))
+            restriction.restrict('field_type', _all_instances_of(field_type))
 
         name = pfield.name[1:]
         if '(' in name:
             # Pointer of array
             name = name[1:-1]
 
-        self.keys[name] = (value, restriction)
+        self.__add_field(name, value, restriction)
 
 
     def __register_data_field(self, data_field: AtomicDataField) -> None:
         restriction = Restriction(data_field.name)
         # If type is a char, then limit to one letter
         if data_field.type_name == 'char':
-            restriction.restrict('field_type', lambda value: isinstance(value, str))
-            restriction.restrict('field_size', lambda value: len(value) == 1)
+            restriction.restrict('field_type', _is_str)
+            restriction.restrict('field_size', _has_length(1))
             value = '\0'
 
         # If it is a bool, then limit to bool type
         elif data_field.type_name == 'bool':
-            restriction.restrict('field_type', lambda value: isinstance(value, bool))
+            restriction.restrict('field_type', _is_bool)
             value = False
 
         # Else search for it and get the min and max value
@@ -216,59 +403,41 @@ class Editable(object, metaclass=ABCMeta):
                 min_value = field_type.min
                 max_value = field_type.max
 
-                restriction.restrict('field_type', lambda value: isinstance(value, python_type))
-                restriction.restrict('field_value', lambda value: min_value <= value <= max_value)
+                restriction.restrict('field_type', _instance_of(python_type))
+                restriction.restrict('field_value', _in_range(min_value, max_value))
 
         if data_field.default is not None:
             value = data_field.default
 
-        self.keys[data_field.name] = (value, restriction)
+        self.__add_field(data_field.name, value, restriction)
 
 
-    def __getattr__(self, name: str) -> Any | None:
-        """
-        Gets the attribute that is in the keys dict, or raises an error
-
-        Args:
-            name (str): Attribute name
-
-        Returns:
-            Any: Stored value
-        """
-        # Returns the dict
-        if name == 'keys':
-            return object.__getattribute__(self, name)
-
-        # Else return the field in the dict
-        if name in self.keys:
-            return self.keys[name][0]
-
-        raise AttributeError(f'\'{type(self).__name__:s}\' object has no attribute {name:s}')
+    # Registration method of each kind of field. Arrays and pointers being data
+    # fields too, the exact type is looked up first
+    _FIELD_HANDLERS: ClassVar[dict[type, Callable[['Editable', Any], None]]] = {
+        AtomicStructField: __register_struct_field,
+        AtomicArrayField: __register_array_field,
+        AtomicFieldPointer: __register_pointer_field,
+        AtomicDataField: __register_data_field,
+    }
 
 
     def __setattr__(self, name: str, value: Any) -> None:
-        # Create the dict only once!
-        if name == 'keys':
-            try:
-                object.__getattribute__(self, name)
-            except:
-                # If object does not exist, then not instantiated
-                object.__setattr__(self, name, value)
-
-        # Else test if is in the dict
-        elif name in self.keys:
-            restriction = self.keys[name][1]
+        # Test if it is a field
+        restrictions = self._restrictions
+        if name in restrictions:
+            restriction = restrictions[name]
             if restriction != None:
+                # Only the new value is validated, other fields did not change.
                 # Do not catch error here, good luck in front end (TODO Verify if need to catch haha)
-                restriction.validate(value=value)
+                if not self._batch_depth:
+                    restriction.validate(value=value)
 
                 # If everything is good then change value
-                self.keys[name] = (value, restriction)
-            
-            self.validate()
+                self.__dict__[name] = value
 
         else:
-            raise AttributeError(f'\'{type(self).__name__:s}\' object has no attribute {name:s}')
+            raise AttributeError(self._missing_attribute + name)
         
 
     def restrict(self, field_name: str, restriction_name: str, validator: Callable[[Any], bool]):
@@ -281,28 +450,86 @@ class Editable(object, metaclass=ABCMeta):
             restriction_name (str): Restriction's name
             validator (Callable[[Any], bool]): Validator function
         """
-        if field_name in self.keys:
-            (_, restriction) = self.keys[field_name]
-            if restriction is not None:
-                restriction.restrict(name=restriction_name, validator=validator)
+        restriction = self._restrictions.get(field_name)
+        if restriction is not None:
+            if restriction.shared:
+                # Other instances use it, restrict a copy of it
+                restriction = restriction.copy()
+                self._restrictions[field_name] = restriction
+            restriction.restrict(name=restriction_name, validator=validator)
 
     
+    @contextmanager
+    def batch(self) -> Iterator['Editable']:
+        """
+        Suspends the validation of each modification, the whole object
+        is validated once when leaving the context.
+
+        For example:
+        >>> with example.batch():
+        >>> ... example.id = 12
+        >>> ... example.age = 30
+
+        Yields:
+            Editable: This object
+        """
+        object.__setattr__(self, '_batch_depth', self._batch_depth + 1)
+        try:
+            yield self
+        finally:
+            object.__setattr__(self, '_batch_depth', self._batch_depth - 1)
+
+        if not self._batch_depth:
+            self.validate()
+
+
     def validate(self):
-        for (value, restriction) in self.keys.values():
-            if restriction is not None:
-                restriction.validate(value=value)
+        # Walks nested Editables with a stack of field iterators rather than
+        # recursive calls, fields are still validated in declaration order
+        stack = [(self.__dict__, iter(self._restrictions.items()))]
+        push = stack.append
+        pop = stack.pop
+        while stack:
+            values, fields = stack[-1]
+            for (name, restriction) in fields:
+                if restriction is not None:
+                    # Custom fields usually have no validators, skip the call
+                    if restriction.validators:
+                        restriction.validate(value=values[name])
+                else:
+                    # In that case value is an Editable
+                    value = values[name]
+                    if isinstance(value, Editable):
+                        push((value.__dict__, iter(value._restrictions.items())))
+                        break
             else:
-                # In that case value is an Editable
-                if isinstance(value, Editable):
-                    value.validate()                
+                pop()
 
 
     @staticmethod
     def create_ndarray(lengths: list[int], value: Any) -> list[Any]:
-        if len(lengths) == 1:
-            return [value] * lengths[0]
-        else:
-            return [Editable.create_ndarray(lengths[:-1], value) for _ in range(0, lengths[-1])]
+        # Built level by level from the outermost dimension, without recursion
+        array: list[Any] = []
+        level = [array]
+        for length in reversed(lengths[1:]):
+            sub_level = []
+            for sub_array in level:
+                sub_array.extend([] for _ in range(length))
+                sub_level.extend(sub_array)
+            level = sub_level
+
+        for sub_array in level:
+            sub_array.extend([value] * lengths[0])
+        return array
+
+
+class _StructEditable(Editable):
+    """
+    Editable of a struct field, created with `from_struct()`
+    """
+
+    def define(self, builder: AtomicStructBuilder, args: Any):
+        pass
 
 
 #     @staticmethod
@@ -1,3 +1,4 @@
+from functools import cache
 from typing import Any, Callable
 
 
@@ -10,6 +11,38 @@ class RestrictionError(Exception):
         super().__init__(f'{restriction_name:s}: Value <{value}> does not respect restriction "{name:s}"')
 
 
+@cache
+def _fused_validator_factory(count: int) -> Callable[..., Callable[[Any], None]]:
+    """
+    Generates the code of a validator checking `count` validators in a row.
+    The code only depends on the number of validators, so it is generated
+    once per count and shared by all restrictions.
+
+    Args:
+        count (int): Number of validators
+
+    Returns:
+        Callable[..., Callable[[Any], None]]: Factory taking the restriction
+        name, the validator names and the validators, returning the fused validator
+    """
+    # Validators are default arguments of the fused validator to be read as locals
+    parameters = ''.join(f', _validator{index:d}' for index in range(count))
+    arguments = ''.join(f', _validator{index:d}=_validator{index:d}' for index in range(count))
+    lines = [
+        f'def _factory(_restriction_name, _names{parameters:s}):\n',
+        f'    def _validate(value{arguments:s}):\n',
+    ]
+    for index in range(count):
+        lines.append(f'        if not _validator{index:d}(value):\n'
+                     f'            raise RestrictionError(_restriction_name, value, _names[{index:d}])\n')
+    lines.append('        return None\n')
+    lines.append('    return _validate\n')
+
+    namespace: dict[str, Any] = {'RestrictionError': RestrictionError}
+    exec(''.join(lines), namespace)
+    return namespace['_factory']
+
+
 class Restriction(object):
     """
     Restriction definition on an attribute's value and/or type
@@ -17,6 +50,9 @@ class Restriction(object):
 
     restriction_name: str
     validators: dict[str, Callable[[Any], bool]]
+    # True if used by many Editables, it must be copied before being restricted
+    shared: bool
+    _compiled: Callable[[Any], None] | None
 
 
     def __init__(self, restriction_name: str, *validators: tuple[str, Callable[[Any], bool]]) -> None:
@@ -28,6 +64,8 @@ class Restriction(object):
         """
         self.restriction_name = restriction_name
         self.validators = {}
+        self.shared = False
+        self._compiled = None
 
         for validator_name, validator in validators:
             self.validators[validator_name] = validator
@@ -63,6 +101,36 @@ class Restriction(object):
             >>>
         """
         self.validators[name] = validator
+        self._compiled = None
+
+
+    def copy(self) -> 'Restriction':
+        """
+        Copies the restriction, validators added to the copy are not added
+        to this restriction. The copy is not shared.
+
+        Returns:
+            Restriction: A restriction with the same name and validators
+        """
+        restriction = Restriction(self.restriction_name)
+        restriction.validators = self.validators.copy()
+        restriction._compiled = self._compiled
+        return restriction
+
+
+    def compile(self) -> Callable[[Any], None]:
+        """
+        Fuses all registered validators into a single function, checking them
+        in a row as local variables rather than iterating on the dict.
+        `validate()` compiles again after a call to `restrict()`.
+
+        Returns:
+            Callable[[Any], None]: Function validating a value, raising
+            RestrictionError if a restriction is not met
+        """
+        factory = _fused_validator_factory(len(self.validators))
+        self._compiled = factory(self.restriction_name, tuple(self.validators), *self.validators.values())
+        return self._compiled
 
 
     def validate(self, value: Any) -> None:
@@ -75,6 +143,7 @@ class Restriction(object):
         Raises:
             RestrictionError: If a restriction is not met
         """
-        for (name, validator) in self.validators.items():
-            if not validator(value):
-                raise RestrictionError(self.restriction_name, value, name)
\ No newline at end of file
+        validator = self._compiled
+        if validator is None:
+            validator = self.compile()
+        validator(value)
\ No newline at end of file
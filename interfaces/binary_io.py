@@ -1,19 +1,21 @@
 from abc import ABCMeta, abstractmethod
 from enum import ReprEnum
 from struct import Struct
+from typing import Any
+
+
+# Formats that a StructModes can have, little endian like the DS
+_STRUCT_MODE_FORMATS = frozenset('<' + char for char in 'bBhHiIqQ')
 
 
 # TODO Find a better name
 class StructModes(Struct, ReprEnum):
     """
-    Enum of struct types
+    Enum of struct types, all in little endian
     """
     def __new__(cls, value: str) -> Struct:
-        if len(value) != 1:
-            raise TypeError('Struct reader\'s mode only has one argument')
-
-        if not isinstance(value, str) or value not in ('b', 'B', 'h', 'H', 'i', 'I', 'q', 'Q'):
-            raise TypeError('Struct reader\'s mode must be one of these characters: bBhHiIqQ')
+        if value not in _STRUCT_MODE_FORMATS:
+            raise TypeError('Struct reader\'s mode must be one of these formats: <b <B <h <H <i <I <q <Q')
 
         struct = Struct(value)
         member = Struct.__new__(cls)
@@ -21,14 +23,14 @@ class StructModes(Struct, ReprEnum):
         return member
     
     
-    int8 = 'b'
-    uint8 = 'B'
-    int16 = 'h'
-    uint16 = 'H'
-    int32 = 'i'
-    uint32 = 'I'
-    int64 = 'q'
-    uint64 = 'Q'
+    int8 = '<b'
+    uint8 = '<B'
+    int16 = '<h'
+    uint16 = '<H'
+    int32 = '<i'
+    uint32 = '<I'
+    int64 = '<q'
+    uint64 = '<Q'
 
 
 class IOHandler(metaclass=ABCMeta):
@@ -68,7 +70,7 @@ class IOHandler(metaclass=ABCMeta):
 
 
     @abstractmethod
-    def read_str(self) -> bytes:
+    def read_str(self) -> str:
         """
         Reads a string from the binary. Strings MUST end with the
         '\\0' character. 
@@ -79,6 +81,23 @@ class IOHandler(metaclass=ABCMeta):
         pass
 
     
+    @abstractmethod
+    def read_batch(self, fmt: str) -> tuple[Any, ...]:
+        """
+        Reads many values at once from the binary, unpacked with the
+        specified struct format (for example 'IHH'). This is faster than
+        reading the values one by one. Without a byte order character, 
+        the format is little endian and not aligned.
+
+        Args:
+            fmt (str): Struct format
+
+        Returns:
+            tuple[Any, ...]: Read values
+        """
+        pass
+
+    
     @abstractmethod
     def write(self, mode: StructModes, value: int) -> None:
         """
@@ -93,13 +112,28 @@ class IOHandler(metaclass=ABCMeta):
 
 
     @abstractmethod
-    def write_bytes(self, rawdata: bytes) -> None:
+    def write_bytes(self, rawdata: bytes | bytearray | memoryview) -> None:
         """
         Writes rawdata to the buffer. Replaces the bytes 
         in place.
 
         Args:
-            rawdata (bytes): Raw data
+            rawdata (bytes | bytearray | memoryview): Raw data
+        """
+        pass
+
+
+    @abstractmethod
+    def write_batch(self, fmt: str, *values: Any) -> None:
+        """
+        Writes many values at once to the buffer, packed with the 
+        specified struct format (for example 'IHH'). Replaces the bytes
+        in place. Without a byte order character, the format is little 
+        endian and not aligned.
+
+        Args:
+            fmt (str): Struct format
+            values (Any): Values to write
         """
         pass
 
@@ -132,7 +166,8 @@ class IOHandler(metaclass=ABCMeta):
     @abstractmethod
     def getvalue(self) -> bytes:
         """
-        Returns the buffer's value. Avoid doing that on big buffers
+        Returns the buffer's value. Avoid doing that on big buffers,
+        the value is copied (see `getvalue_view`)
 
         Returns:
             bytes: Buffer's value
@@ -140,6 +175,18 @@ class IOHandler(metaclass=ABCMeta):
         pass
 
     
+    def getvalue_view(self) -> memoryview:
+        """
+        Returns a view of the buffer's value. Handlers with an in-memory
+        buffer don't copy it, so use it when the value is only written 
+        out or sliced. The buffer can't grow while a view is alive.
+
+        Returns:
+            memoryview: View of the buffer's value
+        """
+        return memoryview(self.getvalue())
+
+    
     @abstractmethod
     def seek(self, position: int) -> None:
         """
@@ -11,7 +11,9 @@ class Loadable(metaclass=ABCMeta):
     @abstractmethod
     def load(self, reader: IOHandler) -> None:
         """
-        Loads what is in the reader in the object
+        Loads what is in the reader in the object. Consecutive fields
+        are better read at once with `reader.read_batch`:
+        >>> self.offset, self.size = reader.read_batch('IH')
 
         Args:
             reader (IOHandler): Reader to read from 
@@ -11,7 +11,8 @@ class Savable(metaclass=ABCMeta):
     @abstractmethod
     def save(self, writer: IOHandler) -> IOHandler:
         """
-        Saves the object in the writer and returns it.
+        Saves the object in the writer and returns it. To write the 
+        saved value out, `writer.getvalue_view()` avoids copying it.
 
         Args:
             writer (IOHandler): Writer to write to 
@@ -0,0 +1,74 @@
+import importlib.util
+import os
+import sys
+import unittest
+from unittest import mock
+
+from rawdb.common import lz
+from rawdb.util.io import IOBytesHandler
+
+
+def _load_without_numba():
+    # Independent copy of the module, using the pure Python search
+    spec = importlib.util.find_spec('rawdb.common.lz')
+    module = importlib.util.module_from_spec(spec)
+    with mock.patch.dict(sys.modules, {'numba': None}):
+        spec.loader.exec_module(module)
+    return module
+
+
+class LZRoundtrip(object):
+    module = None
+
+    def roundtrip(self, data, compression_level=1):
+        reader = IOBytesHandler()
+        reader.write_bytes(data)
+        writer = IOBytesHandler()
+        self.module.LZCompress(reader, writer, compression_level=compression_level)
+        compressed = writer.getvalue()
+        self.assertTrue(self.module.LZ.is_lz(compressed))
+
+        decompressed = self.module.LZ(writer)
+        self.assertEqual(len(data), decompressed.header.size)
+        self.assertEqual(data, decompressed.data)
+        self.assertEqual(data, decompressed.handle.getvalue())
+        return compressed
+
+    def test_empty(self):
+        self.roundtrip(b'')
+
+    def test_short(self):
+        for length in range(1, 4):
+            self.roundtrip(bytes(range(1, length + 1)))
+
+    def test_runs(self):
+        # Overlapping copies, the match is longer than its distance
+        compressed = self.roundtrip(b'a' * 1000 + b'ab' * 500 + b'abc' * 300)
+        self.assertLess(len(compressed), 400)
+
+    def test_random(self):
+        self.roundtrip(os.urandom(5000))
+
+    def test_lazy(self):
+        data = (b'abcdefgh' + os.urandom(3)) * 200 + b'xabcdefghij' * 100
+        for compression_level in (1, self.module._LAZY_LEVEL, 9):
+            self.roundtrip(data, compression_level)
+
+    def test_lazy_runs(self):
+        # Deferring a match must not make run heavy data bigger
+        for data in (b'a' * 28, b'x' + b'a' * 28, b'ab' * 10000, b'abc' * 5000 + b'a' * 3000):
+            size = len(self.roundtrip(data))
+            for compression_level in (self.module._LAZY_LEVEL, 9):
+                self.assertLessEqual(len(self.roundtrip(data, compression_level)), size)
+
+
+class TestLZPython(LZRoundtrip, unittest.TestCase):
+    module = _load_without_numba()
+
+    def test_no_numba(self):
+        self.assertFalse(self.module._HAS_NUMBA)
+
+
+@unittest.skipIf(not lz._HAS_NUMBA, 'Numba is not installed')
+class TestLZNumba(LZRoundtrip, unittest.TestCase):
+    module = lz
@@ -0,0 +1,38 @@
+import unittest
+
+from rawdb.files.graphics.tile_format import NTFP, NTFS, NTFT
+from rawdb.util.io import IOBytesHandler
+
+
+class TestTileFormat(unittest.TestCase):
+    def roundtrip(self, cls, attribute, values, expected):
+        items = []
+        for value in values:
+            item = cls()
+            setattr(item, attribute, value)
+            items.append(item)
+
+        writer = IOBytesHandler()
+        cls.save_many(writer, items)
+        self.assertEqual(expected, writer.getvalue())
+
+        # Same bytes as saving the items one by one
+        single = IOBytesHandler()
+        for item in items:
+            item.save(single)
+        self.assertEqual(expected, single.getvalue())
+
+        writer.seek(0)
+        loaded = cls.load_many(writer, len(values))
+        self.assertTrue(all(isinstance(item, cls) for item in loaded))
+        self.assertEqual(values, [getattr(item, attribute) for item in loaded])
+        self.assertEqual(len(expected), writer.position)
+
+    def test_ntfp(self):
+        self.roundtrip(NTFP, 'palette_color', [0x7FFF, 0, 0x1234], b'\xff\x7f\x00\x00\x34\x12')
+
+    def test_ntft(self):
+        self.roundtrip(NTFT, 'tile_data', [0xFF, 0, 0x12], b'\xff\x00\x12')
+
+    def test_ntfs(self):
+        self.roundtrip(NTFS, 'screen_data', [0xF001, 0, 0x1234], b'\x01\xf0\x00\x00\x34\x12')
@@ -0,0 +1,56 @@
+import os
+import tempfile
+import unittest
+from zipfile import ZipFile
+
+from rawdb.generic.archive import Archive
+
+
+class TestArchive(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'a.zip')
+        with ZipFile(self.path, 'w') as archive:
+            for index in range(0, 12):
+                archive.writestr(f'{index:d}.bin', bytes([index]) * (index + 1))
+
+    def test_export_zip_same_path(self):
+        archive = Archive.from_zip(self.path)
+        archive.export_zip(self.path)
+        new = Archive.from_zip(self.path)
+        self.assertEqual([bytes([index]) * (index + 1) for index in range(0, 12)], list(new))
+        new.close()
+
+    def test_close_keeps_members(self):
+        archive = Archive.from_zip(self.path)
+        archive.close()
+        self.assertEqual(b'\x05' * 6, archive.get(5))
+
+    def test_append_mode_is_not_lazy(self):
+        archive = Archive.from_zip(self.path, 'a')
+        self.assertIsNone(archive._source)
+        self.assertEqual(b'\x0b' * 12, archive.get(11))
+
+    def test_export_bytes_like(self):
+        archive = Archive()
+        archive.add(memoryview(b'view'))
+        archive.add(bytearray(b'array'))
+        archive.add(b'bytes')
+        archive.export_zip(self.path)
+        new = Archive.from_zip(self.path)
+        self.assertEqual([b'view', b'array', b'bytes'], list(new))
+        new.close()
+
+        directory = os.path.join(os.path.dirname(self.path), 'export')
+        archive.export_dir(directory)
+        with open(os.path.join(directory, '0.bin'), 'rb') as file:
+            self.assertEqual(b'view', file.read())
+
+    def test_export_streams(self):
+        archive = Archive.from_zip(self.path)
+        directory = os.path.join(os.path.dirname(self.path), 'export')
+        archive.export_dir(directory)
+        with open(os.path.join(directory, '11.bin'), 'rb') as file:
+            self.assertEqual(b'\x0b' * 12, file.read())
+        archive.close()
@@ -0,0 +1,46 @@
+import unittest
+
+from rawdb.atomic.atomic_struct import FieldTypes
+from rawdb.generic.collection import Collection2d, SizedCollection
+from rawdb.generic.restriction import RestrictionError
+
+
+class TestCollection2d(unittest.TestCase):
+    def test_fill(self):
+        collection = Collection2d(FieldTypes.uint8_t, 3, 4)
+        collection.fill(7, 0, 1, 2, 2)
+        self.assertEqual([[0, 7, 7], [0, 7, 7], [0, 0, 0], [0, 0, 0]], collection.entries)
+
+    def test_fill_out_of_collection(self):
+        # A negative y must not wrap around to the end of the lines
+        collection = Collection2d(FieldTypes.uint8_t, 3, 4)
+        with self.assertRaises(IndexError):
+            collection.fill(7, 0, -1, 2, 2)
+        with self.assertRaises(IndexError):
+            collection.fill(7, 0, 2, 2, 2)
+        self.assertEqual([[0] * 3] * 4, collection.entries)
+
+
+class TestSizedCollection(unittest.TestCase):
+    def test_extend(self):
+        collection = SizedCollection(FieldTypes.uint8_t, 2)
+        collection.extend(value for value in (3, 4, 5))
+        self.assertEqual(5, len(collection))
+        self.assertEqual([0, 0, 3, 4, 5], collection.entries)
+        # The size restriction follows the new length
+        with self.assertRaises(RestrictionError):
+            collection.entries = [0] * 2
+        collection.entries = [0] * 5
+
+    def test_extend_str(self):
+        collection = SizedCollection(FieldTypes.char, 3)
+        collection.extend('ab')
+        self.assertEqual('\0\0ab', collection.entries)
+        with self.assertRaises(RestrictionError):
+            collection.entries = '\0\0'
+        collection.entries = 'abcd'
+
+    def test_extend_not_resizable(self):
+        collection = SizedCollection(FieldTypes.uint8_t, 2, resizable=False)
+        collection.extend([3, 4])
+        self.assertEqual([0, 0], collection.entries)
@@ -0,0 +1,41 @@
+import unittest
+
+from rawdb.atomic.atomic_struct import FieldTypes
+from rawdb.files.generic_header import GenericHeader
+from rawdb.generic import editable
+from rawdb.generic.collection import Collection2d, SizedCollection
+from rawdb.generic.restriction import RestrictionError
+
+
+class TestEditable(unittest.TestCase):
+    def test_instances_share_no_mutable_value(self):
+        first = Collection2d(FieldTypes.uint8_t, 3, 2)
+        second = Collection2d(FieldTypes.uint8_t, 3, 2)
+        first[1, 1] = 5
+        self.assertEqual(0, second[1, 1])
+        for entries, other_entries in zip(first.entries, second.entries):
+            self.assertIsNot(entries, other_entries)
+
+        first = SizedCollection(FieldTypes.uint16_t, 4)
+        second = SizedCollection(FieldTypes.uint16_t, 4)
+        first.append(1)
+        self.assertEqual(5, len(first))
+        self.assertEqual(4, len(second))
+        # The resized restriction is not shared either
+        second.entries = [0] * 4
+        with self.assertRaises(RestrictionError):
+            second.entries = [0] * 5
+
+    def test_struct_cache_is_bounded(self):
+        for width in range(1, editable._STRUCT_CACHE_SIZE + 10):
+            Collection2d(FieldTypes.uint8_t, width, 1)
+        self.assertLessEqual(editable._struct_template.cache_info().currsize, editable._STRUCT_CACHE_SIZE)
+
+    def test_keys_restrictions_are_not_shared(self):
+        first = GenericHeader()
+        second = GenericHeader()
+        first.keys['section_size'][1].restrict('not_5', lambda value: value != 5)
+        with self.assertRaises(RestrictionError):
+            first.section_size = 5
+        second.section_size = 5
+        GenericHeader().section_size = 5
@@ -0,0 +1,110 @@
+import os
+import tempfile
+import unittest
+
+from rawdb.util.io import IOBytesHandler, IOFileHandler, IOMmapHandler
+
+
+class HandlerTestCase(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'handler.bin')
+
+    def handlers(self, mode):
+        yield IOBytesHandler(self.path if 'r' in mode and 'w' not in mode else '')
+        yield IOFileHandler(self.path, mode)
+        yield IOMmapHandler(self.path, mode)
+
+    def written(self, handler):
+        # Closes file handlers so that their content is on disk
+        if isinstance(handler, IOBytesHandler):
+            return handler.getvalue()
+        handler.close()
+        with open(self.path, 'rb') as file:
+            return file.read()
+
+
+class TestBatch(HandlerTestCase):
+    def test_misaligned_format(self):
+        # Native alignment would pad 2 bytes after the H
+        for handler in self.handlers('w'):
+            handler.write_batch('HI', 1, 2)
+            handler.write_batch('>H', 3)
+            self.assertEqual(8, handler.position)
+            self.assertEqual(b'\x01\x00\x02\x00\x00\x00\x00\x03', self.written(handler))
+
+        for handler in self.handlers('r'):
+            self.assertEqual((1, 2), handler.read_batch('HI'))
+            self.assertEqual((3, ), handler.read_batch('>H'))
+            self.assertEqual(8, handler.position)
+            if not isinstance(handler, IOBytesHandler):
+                handler.close()
+
+
+class TestAlign(HandlerTestCase):
+    def test_pads_to_multiple(self):
+        for handler in self.handlers('w'):
+            handler.write_bytes(b'abc')
+            handler.align(4)
+            self.assertEqual(4, handler.position)
+            handler.write_bytes(b'd')
+            handler.align(4, b'\xff')
+            self.assertEqual(8, handler.position)
+            self.assertEqual(b'abc\x00d\xff\xff\xff', self.written(handler))
+
+    def test_already_aligned(self):
+        for handler in self.handlers('w'):
+            handler.align(4)
+            self.assertEqual(0, handler.position)
+            handler.write_bytes(b'abcd')
+            handler.align(4)
+            self.assertEqual(4, handler.position)
+            self.assertEqual(b'abcd', self.written(handler))
+
+    def test_single_byte_value(self):
+        # Only the first byte of the value is used
+        for handler in self.handlers('w'):
+            handler.write_bytes(b'a')
+            handler.align(4, b'xyz')
+            self.assertEqual(b'axxx', self.written(handler))
+
+
+class TestStr(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'str.bin')
+
+    def handlers(self, data):
+        with open(self.path, 'wb') as file:
+            file.write(data)
+        for handler in (IOBytesHandler(self.path),
+                        IOFileHandler(self.path, 'r'),
+                        IOMmapHandler(self.path, 'r')):
+            yield handler
+            if not isinstance(handler, IOBytesHandler):
+                handler.close()
+
+    def test_no_terminator(self):
+        # Longer than a read chunk, the position stays at the end of the data
+        for handler in self.handlers(b'a' * 5000):
+            self.assertEqual('a' * 5000, handler.read_str())
+            self.assertEqual(5000, handler.position)
+
+    def test_terminated(self):
+        # The string ends with a multibyte character, its bytes are kept whole
+        data = 'pokémon é'.encode('utf-8') + b'\0' + b'next\0'
+        for handler in self.handlers(data):
+            self.assertEqual('pokémon é', handler.read_str())
+            self.assertEqual(len('pokémon é'.encode('utf-8')) + 1, handler.position)
+            self.assertEqual('next', handler.read_str())
+            self.assertEqual(len(data), handler.position)
+
+    def test_terminated_after_chunk(self):
+        # The \0 character is past the first read chunk
+        data = b'a' * 5000 + b'\0b'
+        for handler in self.handlers(data):
+            self.assertEqual('a' * 5000, handler.read_str())
+            self.assertEqual(5001, handler.position)
+            self.assertEqual('b', handler.read_str())
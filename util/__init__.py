@@ -62,6 +62,9 @@ def subclasses(cls, recursive=False):
     return subs
 
 
+_NATSORT_SPLIT = re.compile('([0-9]+)').split
+
+
 def natsort_key(key):
     """Produce a natural key for sorting
 
@@ -76,12 +79,10 @@ def natsort_key(key):
     >>> sorted(lst, key=natsort_key)
     ['1.png', '2.png', '10.png']
     """
-    def get_val(chunk):
-        try:
-            return int(chunk)
-        except:
-            return chunk
-    return [get_val(chunk) for chunk in re.split('([0-9]+)', key)]
+    # Splitting on a captured group alternates text and digit chunks
+    chunks = _NATSORT_SPLIT(key)
+    chunks[1::2] = map(int, chunks[1::2])
+    return chunks
 
 
 __all__ = ['cached_property', 'temporary_attr', 'AttrDict',
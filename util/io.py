@@ -1,11 +1,43 @@
-from struct import calcsize
+import mmap
+import os
+from functools import cache
+from struct import Struct
+from typing import IO, Any
 from rawdb.interfaces.binary_io import IOHandler, StructModes
 
+# Number of bytes read at once when searching for the end of a string
+_READ_STR_CHUNK_SIZE = 4096
+# Buffer size of the opened files, small reads and writes rarely reach the disk
+_BUFFER_SIZE = 64 * 1024
+# Struct characters setting the byte order, size and alignment
+_BYTE_ORDER_CHARS = frozenset('@=<>!')
+
+
+@cache
+def _get_struct(fmt: str) -> Struct:
+    """
+    Returns the compiled struct of a format, each format is compiled once.
+    Formats without a byte order character are little endian without 
+    alignment, like StructModes.
+
+    Args:
+        fmt (str): Struct format
+
+    Returns:
+        Struct: Compiled struct
+    """
+    if fmt[:1] not in _BYTE_ORDER_CHARS:
+        fmt = '<' + fmt
+    return Struct(fmt)
+
+
 class IOFileHandler(IOHandler):
     filename: str
     readable: bool
     writable: bool
     position: int
+    _file: IO[bytes]
+    _file_position: int
 
     def __init__(self, filename: str, mode: str = 'rw') -> None:
         """
@@ -15,6 +47,11 @@ class IOFileHandler(IOHandler):
         position 0 will write at position 1 (quite normal, but python r+
         does not follow this.).
 
+        The file is opened once (the 'w' mode truncates it) and stays 
+        open until `close()` is called, or until the end of a with block:
+        >>> with IOFileHandler('example.bin', 'w') as handler:
+        >>> ... handler.write_bytes(b'data')
+
         Args:
             filename (str): File name
             mode (str, optional): Opening mode. Defaults to 'rw'.
@@ -23,108 +60,147 @@ class IOFileHandler(IOHandler):
         self.writable = 'w' in mode
         self.filename = filename
         self.position = 0
+        self._file_position = 0
+
+        if self.readable and self.writable:
+            # Keep the content, but create the file if it does not exist
+            try:
+                self._file = open(filename, 'r+b', buffering=_BUFFER_SIZE)
+            except FileNotFoundError:
+                self._file = open(filename, 'w+b', buffering=_BUFFER_SIZE)
+        elif self.writable:
+            self._file = open(filename, 'wb', buffering=_BUFFER_SIZE)
+        else:
+            self._file = open(filename, 'rb', buffering=_BUFFER_SIZE)
+
+
+    def __enter__(self) -> 'IOFileHandler':
+        return self
+
+
+    def __exit__(self, *_: Any) -> None:
+        self.close()
+
+
+    def close(self) -> None:
+        """
+        Closes the file, the handler can't be used after that
+        """
+        self._file.close()
+
+
+    def _write(self, rawdata: bytes | bytearray | memoryview) -> None:
+        """
+        Writes rawdata at the handler's position and moves after it.
+        Seeking flushes the buffered writes, so it is skipped when the 
+        file is already there (like for consecutive writes)
+
+        Args:
+            rawdata (bytes | bytearray | memoryview): Raw data
+        """
+        if self._file_position != self.position:
+            self._file.seek(self.position)
+        self._file.write(rawdata)
+        self.position += len(rawdata)
+        self._file_position = self.position
 
 
     def read(self, mode: StructModes) -> int:
         if self.readable:
-            with open(self.filename, 'br') as file:
-                # Seek to position
-                file.seek(self.position)
+            # Seek to position, the next write will have to seek again
+            self._file.seek(self.position)
+            self._file_position = -1
 
-                struct_len = calcsize(mode.format)
-                self.position += struct_len
-                return mode.unpack(file.read(struct_len))[0]
+            struct_len = mode.size
+            self.position += struct_len
+            return mode.unpack(self._file.read(struct_len))[0]
 
         # Default value is 0 (char \0)
         return 0
 
     def read_bytes(self, length: int) -> bytes:
         if self.readable:
-            with open(self.filename, 'br') as file:
-                # Seek to position
-                file.seek(self.position)
+            # Seek to position, the next write will have to seek again
+            self._file.seek(self.position)
+            self._file_position = -1
 
-                result = file.read(length)
-                self.position += length
-                return result
+            result = self._file.read(length)
+            self.position += length
+            return result
             
         # Default value is b'\0'
         return b'\0'
 
 
-    def read_str(self) -> str:
+    def read_batch(self, fmt: str) -> tuple[Any, ...]:
+        struct = _get_struct(fmt)
         if self.readable:
-            with open(self.filename, 'br') as file:
-                # Seek to position
-                file.seek(self.position)
-
-                # Search for the \0 character
-                old_position = self.position
-                read_char = b''
-                chars_read = 0
-                while read_char != b'\0':
-                    read_char = file.read(1)
-                    chars_read += 1
-
-                # Return to old position and read the whole bytes
-                file.seek(old_position)
-                bytes_results = file.read(chars_read)
-                self.position += chars_read
-
-                # Return the decoded string MINUS the \0 character
-                return bytes_results.decode('utf-8')[:-1]
-        
-        # Default value is '\0'
-        return '\0'
+            # Seek to position, the next write will have to seek again
+            self._file.seek(self.position)
+            self._file_position = -1
 
+            self.position += struct.size
+            return struct.unpack(self._file.read(struct.size))
 
-    def transform_data(self, value: bytes) -> bytes:
-        # Get value current value
-        data = self.getvalue()
+        # Default values are 0 (char \0)
+        return struct.unpack(bytes(struct.size))
 
-        # Save before position changing
-        first_data = data[:self.position]
 
-        # If position + length is greater or equal to the file length, no work to do
-        if self.position + len(value) >= len(data):
-            result = first_data + value
-        else:
-            last_data = data[self.position + len(value):]
-            result = first_data + value + last_data
-        
-        return result
+    def read_str(self) -> str:
+        if self.readable:
+            file = self._file
+            # Seek to position, the next write will have to seek again
+            file.seek(self.position)
+            self._file_position = -1
+
+            # Read chunks until one has the \0 character (or until the end)
+            chunks = []
+            while True:
+                chunk = file.read(_READ_STR_CHUNK_SIZE)
+                null_index = chunk.find(b'\0')
+                if null_index != -1:
+                    chunks.append(chunk[:null_index])
+                    # Position is after the \0 character
+                    self.position += null_index + 1
+                    break
+
+                chunks.append(chunk)
+                self.position += len(chunk)
+                if len(chunk) < _READ_STR_CHUNK_SIZE:
+                    break
+
+            # Return the decoded string without the \0 character
+            return b''.join(chunks).decode('utf-8')
+
+        # Default value is '\0'
+        return '\0'
 
 
     def write(self, mode: StructModes, value: int) -> None:
         if self.writable:
-            new_data = self.transform_data(mode.pack(value))
-            with open(self.filename, 'bw') as file:
-                file.write(new_data)
-                self.position += calcsize(mode.format)
+            # The file replaces the bytes in place
+            self._write(mode.pack(value))
 
 
-    def write_bytes(self, rawdata: bytes) -> None:
-        if self.writable:            
-            new_data = self.transform_data(rawdata)
-            with open(self.filename, 'bw') as file:
-                file.write(new_data)
-                self.position += len(rawdata)
+    def write_bytes(self, rawdata: bytes | bytearray | memoryview) -> None:
+        if self.writable:
+            self._write(rawdata)
+
+
+    def write_batch(self, fmt: str, *values: Any) -> None:
+        if self.writable:
+            self._write(_get_struct(fmt).pack(*values))
 
 
     def write_str(self, string: str) -> None:
         if self.writable:
-            # Search for a \0, if not present then add it at the end
-            null_index = string.find('\0')
-            if null_index == -1:
-                null_index = len(string)
+            # Add the ending \0 if it is not there already
+            if not string.endswith('\0'):
                 string += '\0'
 
             bytes_string = string.encode('utf-8')
 
-            new_data = self.transform_data(bytes_string)
-            with open(self.filename, 'bw') as file:
-                file.write(new_data)
-                self.position += len(bytes_string)
+            self._write(bytes_string)
 
     
     def align(self, byte_number: int, value: bytes = b'\x00') -> None:
@@ -133,17 +209,18 @@ class IOFileHandler(IOHandler):
             if len(value) > 1:
                 value = value[:1]
 
-            bytes_to_write = value * (self.position % byte_number)
-            new_data = self.transform_data(bytes_to_write)
-            with open(self.filename, 'bw') as file:
-                file.write(new_data)
-                self.position += len(bytes_to_write)
+            # Pad up to the next multiple of byte_number
+            padding = -self.position % byte_number
+            if padding:
+                self._write(value * padding)
 
 
     def getvalue(self) -> bytes:
         if self.readable:
-            with open(self.filename, 'br') as file:
-                return file.read()
+            # Operations always seek to the position first, no need to restore it
+            self._file_position = -1
+            self._file.seek(0)
+            return self._file.read()
 
         # Default value is b'\0'
         return b'\0'
@@ -154,7 +231,7 @@ class IOFileHandler(IOHandler):
 
 
 class IOBytesHandler(IOHandler):
-    content: bytes
+    content: bytearray
     position: int
 
     def __init__(self, filename: str = '') -> None:
@@ -170,76 +247,102 @@ class IOBytesHandler(IOHandler):
         Args:
             filename (str): File name. Defaults to ''
         """
-        self.content = b''
+        # Mutable, so writes replace the bytes in place
+        self.content = bytearray()
         # If empty filename, then no load, just an empty string
         if filename != '':
             with open(filename, 'br') as file:
-                self.content = file.read()
+                self.content = bytearray(file.read())
 
         self.position = 0
 
 
     def read(self, mode: StructModes) -> int:
-        struct_len = calcsize(mode.format)
         result = mode.unpack_from(self.content, self.position)[0]
-        self.position += struct_len
+        self.position += mode.size
         
         return result
     
 
     def read_bytes(self, length: int) -> bytes:
-        result = b''
-        result = self.content[self.position:self.position + length]
+        # Sliced from a view to copy the bytes only once
+        result = bytes(memoryview(self.content)[self.position:self.position + length])
         self.position += length
 
         return result
 
 
+    def read_batch(self, fmt: str) -> tuple[Any, ...]:
+        struct = _get_struct(fmt)
+        result = struct.unpack_from(self.content, self.position)
+        self.position += struct.size
+
+        return result
+
+
     def read_str(self) -> str:
         # Search for the \0 character
         null_index = self.content.find(b'\0', self.position)
-        result = self.content[self.position:null_index]
-        self.position = null_index
-
-        # Return the decoded string MINUS the \0 character
-        return result.decode('utf-8')[:-1]
+        if null_index == -1:
+            # No \0 character, read until the end and stay there
+            end = len(self.content)
+            result = str(memoryview(self.content)[self.position:end], 'utf-8')
+            self.position = end
+            return result
+        # Decoded from a view to copy the bytes only once
+        result = str(memoryview(self.content)[self.position:null_index], 'utf-8')
+        # Position is after the \0 character
+        self.position = null_index + 1
+
+        # Return the string without the \0 character
+        return result
 
 
-    def transform_data(self, value: bytes) -> bytes:
-        # Save before position changing
-        first_data = self.content[:self.position]
+    def _replace(self, value: bytes | bytearray | memoryview) -> None:
+        """
+        Replaces the bytes at the current position and moves after them,
+        the content grows if needed
 
-        # If position + length is greater or equal to the file length, no work to do
-        if self.position + len(value) >= len(self.content):
-            result = first_data + value
-        else:
-            last_data = self.content[self.position + len(value):]
-            result = first_data + value + last_data
-        
-        return result
+        Args:
+            value (bytes | bytearray | memoryview): Bytes to write
+        """
+        end = self.position + len(value)
+        if self.position > len(self.content):
+            # Writing after the end, fill the gap
+            self.content.extend(bytes(self.position - len(self.content)))
+        self.content[self.position:end] = value
+        self.position = end
 
 
     def write(self, mode: StructModes, value: int) -> None:
-        self.content = self.transform_data(mode.pack(value))
-        self.position += calcsize(mode.format)
+        end = self.position + mode.size
+        if end > len(self.content):
+            # Grow the content (and fill any gap), then pack in place
+            self.content.extend(bytes(end - len(self.content)))
+        mode.pack_into(self.content, self.position, value)
+        self.position = end
 
 
-    def write_bytes(self, rawdata: bytes) -> None:
-        self.content = self.transform_data(rawdata)
-        self.position += len(rawdata)
+    def write_batch(self, fmt: str, *values: Any) -> None:
+        struct = _get_struct(fmt)
+        end = self.position + struct.size
+        if end > len(self.content):
+            # Grow the content (and fill any gap), then pack in place
+            self.content.extend(bytes(end - len(self.content)))
+        struct.pack_into(self.content, self.position, *values)
+        self.position = end
+
+
+    def write_bytes(self, rawdata: bytes | bytearray | memoryview) -> None:
+        self._replace(rawdata)
 
 
     def write_str(self, string: str) -> None:
-        # Search for a \0, if not present then add it at the end
-        null_index = string.find('\0')
-        if null_index == -1:
-            null_index = len(string)
+        # Add the ending \0 if it is not there already
+        if not string.endswith('\0'):
             string += '\0'
 
-        bytes_string = string.encode('utf-8')
-
-        self.content = self.transform_data(bytes_string)
-        self.position += len(bytes_string)
+        self._replace(string.encode('utf-8'))
 
     
     def align(self, byte_number: int, value: bytes = b'\x00') -> None:
@@ -247,15 +350,217 @@ class IOBytesHandler(IOHandler):
         if len(value) > 1:
             value = value[:1]
 
-        bytes_to_write = value * (self.position % byte_number)
-        self.content = self.transform_data(bytes_to_write)
-        self.position += len(bytes_to_write)
+        # Pad up to the next multiple of byte_number
+        padding = -self.position % byte_number
+        if padding:
+            self._replace(value * padding)
 
 
     def getvalue(self) -> bytes:
-        return self.content
+        return bytes(self.content)
+
+
+    def getvalue_view(self) -> memoryview:
+        return memoryview(self.content)
     
 
     def seek(self, position: int) -> None:
         self.position = position
 
+
+class IOMmapHandler(IOHandler):
+    filename: str
+    readable: bool
+    writable: bool
+    position: int
+    _file: IO[bytes]
+    _mm: mmap.mmap | None
+
+    def __init__(self, filename: str, mode: str = 'rw') -> None:
+        """
+        Creates a new IOHandler with a memory-mapped file. The mode is 
+        either 'r', 'w' or 'rw' like `IOFileHandler`. Only the accessed 
+        pages of the file are loaded, reads are not copied through a buffer 
+        and writes replace the bytes in place (the file grows if needed).
+        It is made for big files, like ROMs.
+
+        The file stays mapped until `close()` is called, or until the end
+        of a with block:
+        >>> with IOMmapHandler('example.nds', 'r') as handler:
+        >>> ... magic = handler.read_bytes(4)
+
+        Args:
+            filename (str): File name
+            mode (str, optional): Opening mode. Defaults to 'rw'.
+        """
+        self.readable = 'r' in mode
+        self.writable = 'w' in mode
+        self.filename = filename
+        self.position = 0
+
+        if self.readable and self.writable:
+            # Keep the content, but create the file if it does not exist
+            try:
+                self._file = open(filename, 'r+b')
+            except FileNotFoundError:
+                self._file = open(filename, 'w+b')
+        elif self.writable:
+            self._file = open(filename, 'w+b')
+        else:
+            self._file = open(filename, 'rb')
+
+        # An empty file can't be mapped, it will be on the first write
+        self._mm = None
+        if os.fstat(self._file.fileno()).st_size > 0:
+            access = mmap.ACCESS_WRITE if self.writable else mmap.ACCESS_READ
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=access)
+
+
+    def __enter__(self) -> 'IOMmapHandler':
+        return self
+
+
+    def __exit__(self, *_: Any) -> None:
+        self.close()
+
+
+    def close(self) -> None:
+        """
+        Unmaps and closes the file, the handler can't be used after that
+        """
+        if self._mm is not None:
+            self._mm.close()
+        self._file.close()
+
+
+    def _reserve(self, length: int) -> mmap.mmap:
+        """
+        Grows the file (filled with \\0) so that length bytes can be 
+        written at the current position
+
+        Args:
+            length (int): Number of bytes to write
+
+        Returns:
+            mmap.mmap: The file's mapping
+        """
+        end = self.position + length
+        if self._mm is None:
+            self._file.truncate(end)
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_WRITE)
+        elif end > len(self._mm):
+            self._mm.resize(end)
+        return self._mm
+
+
+    def read(self, mode: StructModes) -> int:
+        if self.readable and self._mm is not None:
+            result = mode.unpack_from(self._mm, self.position)[0]
+            self.position += mode.size
+            return result
+
+        # Default value is 0 (char \0)
+        return 0
+
+
+    def read_bytes(self, length: int) -> bytes:
+        if self.readable and self._mm is not None:
+            result = self._mm[self.position:self.position + length]
+            self.position += length
+            return result
+
+        # Default value is b'\0'
+        return b'\0'
+
+
+    def read_batch(self, fmt: str) -> tuple[Any, ...]:
+        struct = _get_struct(fmt)
+        if self.readable and self._mm is not None:
+            result = struct.unpack_from(self._mm, self.position)
+            self.position += struct.size
+            return result
+
+        # Default values are 0 (char \0)
+        return struct.unpack(bytes(struct.size))
+
+
+    def read_str(self) -> str:
+        if self.readable and self._mm is not None:
+            # Search for the \0 character directly in the mapping
+            null_index = self._mm.find(b'\0', self.position)
+            if null_index == -1:
+                # No \0 character, read until the end and stay there
+                result = self._mm[self.position:]
+                self.position = len(self._mm)
+                return result.decode('utf-8')
+            result = self._mm[self.position:null_index]
+            # Position is after the \0 character
+            self.position = null_index + 1
+
+            # Return the decoded string without the \0 character
+            return result.decode('utf-8')
+
+        # Default value is '\0'
+        return '\0'
+
+
+    def write(self, mode: StructModes, value: int) -> None:
+        if self.writable:
+            mode.pack_into(self._reserve(mode.size), self.position, value)
+            self.position += mode.size
+
+
+    def write_batch(self, fmt: str, *values: Any) -> None:
+        if self.writable:
+            struct = _get_struct(fmt)
+            struct.pack_into(self._reserve(struct.size), self.position, *values)
+            self.position += struct.size
+
+
+    def write_bytes(self, rawdata: bytes | bytearray | memoryview) -> None:
+        if self.writable:
+            end = self.position + len(rawdata)
+            self._reserve(len(rawdata))[self.position:end] = rawdata
+            self.position = end
+
+
+    def write_str(self, string: str) -> None:
+        if self.writable:
+            # Add the ending \0 if it is not there already
+            if not string.endswith('\0'):
+                string += '\0'
+
+            self.write_bytes(string.encode('utf-8'))
+
+
+    def align(self, byte_number: int, value: bytes = b'\x00') -> None:
+        if self.writable:
+            # Check if value is a single byte
+            if len(value) > 1:
+                value = value[:1]
+
+            # Pad up to the next multiple of byte_number
+            padding = -self.position % byte_number
+            if padding:
+                self.write_bytes(value * padding)
+
+
+    def getvalue(self) -> bytes:
+        if self.readable:
+            # An empty file is not mapped yet
+            return self._mm[:] if self._mm is not None else b''
+
+        # Default value is b'\0'
+        return b'\0'
+
+
+    def getvalue_view(self) -> memoryview:
+        if self.readable and self._mm is not None:
+            # The mapping can't be resized or closed while the view is alive
+            return memoryview(self._mm)
+
+        return memoryview(self.getvalue())
+
+
+    def seek(self, position: int) -> None:
+        self.position = position
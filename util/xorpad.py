@@ -1,11 +1,25 @@
-from itertools import izip
+# NumPy is optional, it only speeds up the XOR
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
 BLOCK_READ_SIZE = 0x100000
 
 
+def _xor_block(data1, data2):
+    """XOR two blocks of the same length at once"""
+    if numpy is not None:
+        return numpy.bitwise_xor(numpy.frombuffer(data1, dtype=numpy.uint8),
+                                 numpy.frombuffer(data2, dtype=numpy.uint8)).tobytes()
+    # Big integers are XORed in C too
+    return (int.from_bytes(data1, 'little') ^ int.from_bytes(data2, 'little'))\
+        .to_bytes(len(data1), 'little')
+
+
 def xorstream(fname1, fname2, outname):
     """Open two files and write their xorstream to a third file immediately"""
-    with open(fname1) as handle1, open(fname2) as handle2,\
+    with open(fname1, 'rb') as handle1, open(fname2, 'rb') as handle2,\
             open(outname, 'wb') as out:
         moredata = True
         while moredata:
@@ -13,10 +27,9 @@ def xorstream(fname1, fname2, outname):
             data2 = handle2.read(BLOCK_READ_SIZE)
             if len(data1) < BLOCK_READ_SIZE or len(data2) < BLOCK_READ_SIZE:
                 moredata = False
-            buffer = ''
-            for ch1, ch2 in izip(data1, data2):
-                buffer += chr(ord(ch1) ^ ord(ch2))
-            out.write(buffer)
+            # Stops at the end of the shortest file
+            size = min(len(data1), len(data2))
+            out.write(_xor_block(data1[:size], data2[:size]))
 
 
 if __name__ == '__main__':